@@ -1,107 +1,26 @@
 """
 Hook de verificacao de citacoes.
 Executado apos salvar documentos para garantir rastreabilidade.
+
+Entrada fina: toda a logica (padroes compilados, cache de fontes,
+verificacao) vive em ``_citation_core`` para ser importada uma unica
+vez por processo.
 """
 
 import json
-import os
-import re
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-def load_valid_sources(sources_log: str, price_log: str) -> set:
-    """Load all valid source IDs from both log files."""
-    valid = set()
-    for log_path in [sources_log, price_log]:
-        path = Path(log_path)
-        if not path.exists():
-            continue
-        with path.open() as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    source = json.loads(line)
-                    if source.get("status") == "vigente":
-                        valid.add(source["id"])
-    return valid
-
-
-def check_citations(content: str, valid_sources: set) -> dict:
-    """Verify all citations in a document are valid."""
-    # Find all citations in the format [Fonte: ID | ...]
-    pattern = r"\[Fonte:\s*(\S+)\s*\|"
-    citations = re.findall(pattern, content)
-
-    invalid = []
-    for citation_id in citations:
-        if citation_id not in valid_sources:
-            invalid.append(citation_id)
-
-    # Check for normative statements without citations
-    normative_patterns = [
-        r"conforme\s+(?:o\s+)?(?:art\.?|artigo)",
-        r"nos\s+termos\s+d[ao]",
-        r"de\s+acordo\s+com\s+a\s+Lei",
-        r"previsto\s+n[ao]",
-    ]
-
-    uncited = []
-    for norm_pattern in normative_patterns:
-        matches = re.finditer(norm_pattern, content, re.IGNORECASE)
-        for match in matches:
-            context = content[match.start():match.start() + 200]
-            if "[Fonte:" not in context:
-                line_num = content[:match.start()].count("\n") + 1
-                uncited.append(
-                    f"Linha ~{line_num}: '{match.group()}...'"
-                )
-
-    return {
-        "valid": len(invalid) == 0 and len(uncited) == 0,
-        "total_citations": len(citations),
-        "invalid_citations": invalid,
-        "uncited_statements": uncited,
-    }
-
-
-def _run_check(content: str, file_path_str: str):
-    """Run citation check and print results."""
-    # Only check markdown files
-    if not file_path_str.endswith((".md", ".markdown")):
-        sys.exit(0)
-
-    sources_log = os.environ.get(
-        "SOURCES_LOG", "sources/sources_log.jsonl"
-    )
-    price_log = os.environ.get(
-        "PRICE_SOURCES_LOG", "sources/price_sources_log.jsonl"
-    )
-
-    valid_sources = load_valid_sources(sources_log, price_log)
-    result = check_citations(content, valid_sources)
-
-    if not result["valid"]:
-        print("VERIFICACAO DE CITACOES:")
-        if result["invalid_citations"]:
-            print(
-                f"  Citacoes invalidas: {result['invalid_citations']}"
-            )
-        if result["uncited_statements"]:
-            print("  Afirmacoes normativas sem citacao:")
-            for stmt in result["uncited_statements"][:5]:
-                print(f"    {stmt}")
-            if len(result["uncited_statements"]) > 5:
-                remaining = len(result["uncited_statements"]) - 5
-                print(f"    ... e mais {remaining}")
-    else:
-        print(
-            f"Citacoes verificadas: {result['total_citations']} "
-            f"citacao(oes) valida(s)"
-        )
+from _citation_core import (  # noqa: E402
+    _run_check,
+    check_citations,
+    load_valid_sources,
+    serve_daemon,
+)
 
-    # Citation check is advisory, does not block
-    sys.exit(0)
+__all__ = ["check_citations", "load_valid_sources"]
 
 
 def main():
@@ -120,9 +39,19 @@ def main():
         action="store_true",
         help="Read Claude Code hook JSON from stdin",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Long-lived mode: one JSON request per stdin line, "
+            "one JSON result per stdout line"
+        ),
+    )
     args = parser.parse_args()
 
-    if args.stdin_check:
+    if args.daemon:
+        serve_daemon()
+    elif args.stdin_check:
         # Claude Code hook mode: read JSON with tool_input
         raw = sys.stdin.read().strip()
         if not raw:
@@ -147,6 +76,11 @@ def main():
             sys.exit(1)
 
         file_path = Path(args.file)
+
+        # Skip the read+decode for files _run_check would ignore
+        if file_path.suffix not in (".md", ".markdown"):
+            sys.exit(0)
+
         if not file_path.exists():
             print(f"Arquivo nao encontrado: {args.file}")
             sys.exit(1)
@@ -8,30 +8,97 @@ import re
 import sys
 from pathlib import Path
 
+# Patterns compiled once at import; validators only look them up.
+_CITATION_PATTERN = r"\[Fonte:\s*[^\]]+\]"
+_MONEY_PATTERN = r"R\$\s*[\d.,]+"
+
+
+def _build_scanner(sections):
+    """Compile one alternation regex covering all section patterns
+    plus the citation and money patterns, so a single finditer pass
+    scans the document instead of one search per pattern."""
+    parts = [
+        f"(?P<s{i}>{pattern})"
+        for i, (_, pattern) in enumerate(sections)
+    ]
+    parts.append(f"(?P<fonte>{_CITATION_PATTERN})")
+    parts.append(f"(?P<valor>{_MONEY_PATTERN})")
+    combined = re.compile("|".join(parts), re.IGNORECASE)
+    individual = [
+        (name, re.compile(pattern, re.IGNORECASE))
+        for name, pattern in sections
+    ]
+    return combined, individual
+
+
+def _scan_document(content, scanner):
+    """Single-pass scan returning missing sections and citation/money
+    counts. The alternation marks one group per position, so a heading
+    matching two section patterns only flags the first; stragglers are
+    re-checked individually before being reported missing. Os padroes
+    de secao usam .*? preguicoso para que o match termine na palavra-
+    chave e nao engula citacoes ou valores no resto da linha do
+    titulo."""
+    combined, individual = scanner
+    found = set()
+    citations = 0
+    money_values = 0
+    for m in combined.finditer(content):
+        group = m.lastgroup
+        if group == "fonte":
+            citations += 1
+        elif group == "valor":
+            money_values += 1
+        else:
+            found.add(group)
+
+    missing = [
+        name
+        for i, (name, section_re) in enumerate(individual)
+        if f"s{i}" not in found and not section_re.search(content)
+    ]
+    return missing, citations, money_values
+
+
+_ETP_SCANNER = _build_scanner([
+    ("Descricao da Necessidade", r"##?\s*\d*\.?\s*Descri"),
+    ("Requisitos da Contratacao", r"##?\s*\d*\.?\s*Requisitos"),
+    ("Estimativa de Quantidades", r"##?\s*\d*\.?\s*Estimativa.*?Quant"),
+    ("Estimativa de Valor", r"##?\s*\d*\.?\s*Estimativa.*?Valor"),
+    ("Justificativa da Solucao", r"##?\s*\d*\.?\s*Justificativa"),
+])
+
+_TR_SCANNER = _build_scanner([
+    ("Objeto", r"##?\s*\d*\.?\s*Objeto"),
+    ("Fundamentacao Legal", r"##?\s*\d*\.?\s*Fundamenta"),
+    ("Descricao da Solucao", r"##?\s*\d*\.?\s*Descri.*?Solu"),
+    ("Requisitos Tecnicos", r"##?\s*\d*\.?\s*Requisitos"),
+    ("Modelo de Execucao", r"##?\s*\d*\.?\s*Modelo.*?Execu"),
+    ("Estimativa de Precos", r"##?\s*\d*\.?\s*Estimativa.*?Pre"),
+])
+
+_PARECER_SCANNER = _build_scanner([
+    ("Identificacao", r"##?\s*\d*\.?\s*Identifica"),
+    ("Questao Analisada", r"##?\s*\d*\.?\s*Quest"),
+    ("Fundamentacao", r"##?\s*\d*\.?\s*Fundamenta"),
+    ("Conclusao", r"##?\s*\d*\.?\s*Conclus"),
+])
+
 
 def validate_etp(content: str) -> dict:
     """Valida estrutura e conteudo de um ETP."""
     errors = []
     warnings = []
 
-    required_sections = [
-        ("Descricao da Necessidade", r"##?\s*\d*\.?\s*Descri"),
-        ("Requisitos da Contratacao", r"##?\s*\d*\.?\s*Requisitos"),
-        ("Estimativa de Quantidades", r"##?\s*\d*\.?\s*Estimativa.*Quant"),
-        ("Estimativa de Valor", r"##?\s*\d*\.?\s*Estimativa.*Valor"),
-        ("Justificativa da Solucao", r"##?\s*\d*\.?\s*Justificativa"),
-    ]
-
-    for section_name, pattern in required_sections:
-        if not re.search(pattern, content, re.IGNORECASE):
-            errors.append(f"Secao obrigatoria ausente: {section_name}")
+    missing, citations, money_values = _scan_document(
+        content, _ETP_SCANNER
+    )
+    for section_name in missing:
+        errors.append(f"Secao obrigatoria ausente: {section_name}")
 
-    citations = re.findall(r"\[Fonte:\s*[^\]]+\]", content)
     if not citations:
         warnings.append("Nenhuma citacao de fonte encontrada no documento")
 
-    money_pattern = r"R\$\s*[\d.,]+"
-    money_values = re.findall(money_pattern, content)
     if not money_values:
         warnings.append(
             "Nenhum valor monetario encontrado - verificar estimativa"
@@ -41,8 +108,8 @@ def validate_etp(content: str) -> dict:
         "valid": len(errors) == 0,
         "errors": errors,
         "warnings": warnings,
-        "citations_count": len(citations),
-        "money_values_count": len(money_values),
+        "citations_count": citations,
+        "money_values_count": money_values,
     }
 
 
@@ -51,20 +118,10 @@ def validate_tr(content: str) -> dict:
     errors = []
     warnings = []
 
-    required_sections = [
-        ("Objeto", r"##?\s*\d*\.?\s*Objeto"),
-        ("Fundamentacao Legal", r"##?\s*\d*\.?\s*Fundamenta"),
-        ("Descricao da Solucao", r"##?\s*\d*\.?\s*Descri.*Solu"),
-        ("Requisitos Tecnicos", r"##?\s*\d*\.?\s*Requisitos"),
-        ("Modelo de Execucao", r"##?\s*\d*\.?\s*Modelo.*Execu"),
-        ("Estimativa de Precos", r"##?\s*\d*\.?\s*Estimativa.*Pre"),
-    ]
-
-    for section_name, pattern in required_sections:
-        if not re.search(pattern, content, re.IGNORECASE):
-            errors.append(f"Secao obrigatoria ausente: {section_name}")
+    missing, citations, _ = _scan_document(content, _TR_SCANNER)
+    for section_name in missing:
+        errors.append(f"Secao obrigatoria ausente: {section_name}")
 
-    citations = re.findall(r"\[Fonte:\s*[^\]]+\]", content)
     if not citations:
         warnings.append("Nenhuma citacao de fonte encontrada")
 
@@ -75,7 +132,7 @@ def validate_tr(content: str) -> dict:
         "valid": len(errors) == 0,
         "errors": errors,
         "warnings": warnings,
-        "citations_count": len(citations),
+        "citations_count": citations,
     }
 
 
@@ -84,18 +141,12 @@ def validate_parecer(content: str) -> dict:
     errors = []
     warnings = []
 
-    required_sections = [
-        ("Identificacao", r"##?\s*\d*\.?\s*Identifica"),
-        ("Questao Analisada", r"##?\s*\d*\.?\s*Quest"),
-        ("Fundamentacao", r"##?\s*\d*\.?\s*Fundamenta"),
-        ("Conclusao", r"##?\s*\d*\.?\s*Conclus"),
-    ]
-
-    for section_name, pattern in required_sections:
-        if not re.search(pattern, content, re.IGNORECASE):
-            errors.append(f"Secao obrigatoria ausente: {section_name}")
+    missing, citations, _ = _scan_document(
+        content, _PARECER_SCANNER
+    )
+    for section_name in missing:
+        errors.append(f"Secao obrigatoria ausente: {section_name}")
 
-    citations = re.findall(r"\[Fonte:\s*[^\]]+\]", content)
     if not citations:
         warnings.append("Nenhuma citacao de fonte encontrada")
 
@@ -103,7 +154,7 @@ def validate_parecer(content: str) -> dict:
         "valid": len(errors) == 0,
         "errors": errors,
         "warnings": warnings,
-        "citations_count": len(citations),
+        "citations_count": citations,
     }
 
 
@@ -150,6 +201,44 @@ def _run_validation(doc_type: str, content: str):
         sys.exit(1)
 
 
+def _serve_daemon():
+    """Long-lived worker mode: read one JSON request per line from
+    stdin ({"file_path": ..., "content": ...}) and emit one JSON
+    result per line, amortizing interpreter startup and pattern
+    compilation across a whole editing session."""
+    import json as _json
+
+    validators = {
+        "etp": validate_etp,
+        "tr": validate_tr,
+        "parecer": validate_parecer,
+    }
+
+    for raw in sys.stdin:
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            request = _json.loads(raw)
+        except _json.JSONDecodeError:
+            print(_json.dumps({"error": "invalid request"}))
+            sys.stdout.flush()
+            continue
+
+        file_path = request.get("file_path", "")
+        content = request.get("content", "")
+        doc_type = _detect_doc_type(file_path)
+        if doc_type not in validators:
+            print(_json.dumps({"skipped": True}))
+            sys.stdout.flush()
+            continue
+
+        result = validators[doc_type](content)
+        result["doc_type"] = doc_type
+        print(_json.dumps(result, ensure_ascii=False))
+        sys.stdout.flush()
+
+
 def main():
     import json as _json
 
@@ -171,9 +260,19 @@ def main():
         action="store_true",
         help="Read Claude Code hook JSON from stdin",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help=(
+            "Long-lived mode: one JSON request per stdin line, "
+            "one JSON result per stdout line"
+        ),
+    )
     args = parser.parse_args()
 
-    if args.stdin_check:
+    if args.daemon:
+        _serve_daemon()
+    elif args.stdin_check:
         # Claude Code hook mode: read JSON with tool_input from stdin
         raw = sys.stdin.read().strip()
         if not raw:
@@ -9,48 +9,55 @@ import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 def load_sources(log_path: str) -> dict:
     """Load sources from a JSONL log file into a dict keyed by id."""
-    sources = {}
     path = Path(log_path)
     if not path.exists():
-        return sources
-    with path.open() as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                source = json.loads(line)
-                sources[source["id"]] = source
-    return sources
+        return {}
+    # Bulk read + map/filter keeps the per-line loop in C instead of
+    # a Python-level strip/parse per iteration.
+    data = path.read_bytes()
+    return {
+        source["id"]: source
+        for source in map(
+            _json_loads, filter(None, data.splitlines())
+        )
+    }
 
 
-def validate_source_status(source: dict) -> list:
-    """Check that a source is active and recently verified."""
-    warnings = []
+def validate_source_status(source: dict, cutoff_iso: str, emit):
+    """Check that a source is active and recently verified.
 
+    ``cutoff_iso`` is the ISO-8601 date 180 days before now, computed
+    once by the caller; well-formed ISO dates compare correctly as
+    strings, so no per-source datetime parsing is needed. Findings are
+    streamed through ``emit`` instead of accumulated in a list.
+    """
     if source.get("status") != "vigente":
-        warnings.append(
+        emit(
             f"Fonte {source['id']} nao esta vigente. "
             f"Status: {source.get('status')}"
         )
 
     verificado = source.get("verificado_em")
     if verificado:
-        ver_date = datetime.fromisoformat(verificado)
-        age = datetime.now() - ver_date
-        if age > timedelta(days=180):
-            warnings.append(
+        if verificado < cutoff_iso:
+            emit(
                 f"Fonte {source['id']} verificada ha mais de 6 meses "
                 f"({verificado}). Recomenda-se re-verificacao."
             )
     else:
-        warnings.append(
+        emit(
             f"Fonte {source['id']} sem data de verificacao registrada."
         )
 
-    return warnings
-
 
 def validate_minimum_sources(source_ids: list, sources: dict) -> list:
     """Check that at least 3 valid sources are available."""
@@ -92,33 +99,43 @@ def main():
         sys.exit(1)
 
     ids_to_check = args.ids if args.ids else list(sources.keys())
-    all_warnings = []
-    all_errors = []
+
+    cutoff_iso = (
+        datetime.now() - timedelta(days=180)
+    ).isoformat(timespec="seconds")
+
+    # Stream findings as they are discovered instead of accumulating
+    # every message string; only two booleans are retained. Cada
+    # linha carrega a propria severidade, entao erros e avisos
+    # intercalados nunca se confundem.
+    had_errors = False
+    had_warnings = False
+
+    def emit_error(msg: str):
+        nonlocal had_errors
+        had_errors = True
+        print(f"ERRO: {msg}")
+
+    def emit_warning(msg: str):
+        nonlocal had_warnings
+        had_warnings = True
+        print(f"AVISO: {msg}")
 
     for sid in ids_to_check:
         if sid not in sources:
-            all_errors.append(f"Fonte {sid} nao encontrada no log.")
+            emit_error(f"Fonte {sid} nao encontrada no log.")
             continue
-        warnings = validate_source_status(sources[sid])
-        all_warnings.extend(warnings)
-
-    min_errors = validate_minimum_sources(ids_to_check, sources)
-    all_errors.extend(min_errors)
-
-    if all_errors:
-        print("ERROS:")
-        for e in all_errors:
-            print(f"  {e}")
+        validate_source_status(
+            sources[sid], cutoff_iso, emit_warning
+        )
 
-    if all_warnings:
-        print("AVISOS:")
-        for w in all_warnings:
-            print(f"  {w}")
+    for e in validate_minimum_sources(ids_to_check, sources):
+        emit_error(e)
 
-    if not all_errors and not all_warnings:
+    if not had_errors and not had_warnings:
         print("Todas as fontes validadas com sucesso.")
 
-    sys.exit(1 if all_errors else 0)
+    sys.exit(1 if had_errors else 0)
 
 
 if __name__ == "__main__":
@@ -11,12 +11,14 @@ Usage:
     python -m evaluations.run_eval
 """
 
+import argparse
 import asyncio
-import csv
+import io
 import json
 import os
-import subprocess
 import sys
+import tempfile
+from collections import Counter
 from pathlib import Path
 
 # Ensure project root is on the path
@@ -24,25 +26,121 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 os.chdir(PROJECT_ROOT)
 
+# Imports de tools resolvidos uma unica vez na carga do modulo;
+# evita reexecutar o import (e o lock do sistema de imports) dentro
+# de cada corrotina de teste.
+from tools.anp_client import ANPClient  # noqa: E402
+from tools.bps_client import BPSClient, CMEDPreco  # noqa: E402
+from tools.http_utils import (  # noqa: E402
+    CachedHTTPClient,
+    TTLCache,
+    load_credentials,
+)
+from tools.logging_config import audit_log  # noqa: E402
+from tools.pncp_client import PNCPClient  # noqa: E402
+from tools.procurement_mcp_server import (  # noqa: E402
+    ProcurementTools,
+)
+from tools.sicro_client import SICROClient  # noqa: E402
+from tools.sinapi_client import SINAPIClient  # noqa: E402
+
+
+# Payloads fixos dos testes de parsing CSV, construidos uma
+# unica vez na carga do modulo.
+_SINAPI_CSV = (
+    "CODIGO;DESCRICAO;UNIDADE;PRECO UNITARIO\n"
+    "87529;PINTURA LATEX PVA;M2;12,50\n"
+    "87878;PISO CERAMICO;M2;45,30\n"
+    "93358;ELETRODUTO PVC;M;8,75\n"
+)
+
+_SICRO_CSV = (
+    "CODIGO;DESCRICAO;UNIDADE;PRECO UNITARIO\n"
+    "5914242;ESCAVACAO MECANICA;M3;8,45\n"
+    "4011631;TRANSPORTE LOCAL MATERIAL;TKM;1,20\n"
+    "5914315;COMPACTACAO DE ATERRO;M3;5,60\n"
+)
+
+_ANP_CSV = (
+    "COMBUSTIVEL;MUNICIPIO;ESTADO;"
+    "PRECO_REVENDA;BANDEIRA;DATA_COLETA;NOME_POSTO\n"
+    "GASOLINA COMUM;EXTREMA;MG;"
+    "5,89;BRANCA;2026-01-25;POSTO A\n"
+    "GASOLINA COMUM;EXTREMA;MG;"
+    "5,95;SHELL;2026-01-25;POSTO B\n"
+    "DIESEL S10;EXTREMA;MG;"
+    "6,15;BRANCA;2026-01-25;POSTO C\n"
+)
+
+_BPS_CSV = (
+    "MEDICAMENTO;APRESENTACAO;PRINCIPIO_ATIVO;"
+    "PRECO_UNITARIO;ORGAO;UF;DATA_COMPRA;"
+    "QUANTIDADE;MODALIDADE\n"
+    "RISPERIDONA 2MG;COMPRIMIDO;RISPERIDONA;"
+    "0,15;PREF EXEMPLO;MG;2025-06-15;5000;PREGAO\n"
+    "RISPERIDONA 2MG;COMPRIMIDO;RISPERIDONA;"
+    "0,18;SEC SAUDE;SP;2025-07-10;10000;PREGAO\n"
+    "RISPERIDONA 2MG;COMPRIMIDO;RISPERIDONA;"
+    "0,12;HOSPITAL X;MG;2025-08-01;3000;PREGAO\n"
+)
+
+# Os subprocessos de hook herdam o ambiente do runner (env=None);
+# basta definir as variaveis uma vez aqui, sem copiar os.environ.
+os.environ.setdefault(
+    "SOURCES_LOG",
+    str(PROJECT_ROOT / "sources" / "sources_log.jsonl"),
+)
+os.environ.setdefault(
+    "PRICE_SOURCES_LOG",
+    str(PROJECT_ROOT / "sources" / "price_sources_log.jsonl"),
+)
+
 PASS = "PASS"
 FAIL = "FAIL"
 SKIP = "SKIP"
 
 
+_STATUS_TAG = {"PASS": "+", "FAIL": "!", "SKIP": "~"}
+
+_HOOKS_DIR = PROJECT_ROOT / ".claude" / "hooks"
+
+# Quando True (--subprocess-hooks), os testes de hook exercitam os
+# scripts via subprocess como antes; o padrao e chama-los in-process,
+# eliminando o cold-start do interpretador por invocacao.
+_SUBPROCESS_HOOKS = False
+
+
+def _load_hook_module(name: str):
+    """Importa um script de hook como modulo (diretorio .claude nao
+    e um pacote importavel)."""
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(
+        name, _HOOKS_DIR / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
 def result_line(test_id: str, status: str, detail: str = ""):
-    tag = {"PASS": "+", "FAIL": "!", "SKIP": "~"}[status]
-    msg = f"  [{tag}] {test_id}"
-    if detail:
-        msg += f" -- {detail}"
-    print(msg)
-    return status
+    """Formata uma linha de resultado sem imprimi-la.
+
+    Retorna (status, linha); os grupos acumulam essas tuplas e o
+    main() emite tudo de uma vez, evitando prints intercalados
+    enquanto os grupos rodam concorrentes.
+    """
+    msg = (
+        f"  [{_STATUS_TAG[status]}] {test_id}"
+        + (f" -- {detail}" if detail else "")
+    )
+    return status, msg
 
 
-async def test_source_loading():
+async def test_source_loading(tools):
     """Test that ProcurementTools loads sources correctly."""
-    from tools.procurement_mcp_server import ProcurementTools
-
-    tools = ProcurementTools()
+    header = "[1] Source loading and validation"
     results = []
 
     # T1: sources loaded
@@ -95,16 +193,13 @@ async def test_source_loading():
             "should have been invalid",
         ))
 
-    await tools.close()
-    return results
+    return header, results
 
 
-async def test_pncp_client():
+async def test_pncp_client(http):
     """Test PNCP client instantiation and search."""
-    from tools.pncp_client import PNCPClient
-    from tools.http_utils import CachedHTTPClient
 
-    http = CachedHTTPClient()
+    header = "[2] PNCP client"
     client = PNCPClient(http=http)
     results = []
 
@@ -120,42 +215,17 @@ async def test_pncp_client():
             "T5-pncp-search-structure", FAIL,
         ))
 
-    await http.close()
-    return results
+    return header, results
 
 
-async def test_sinapi_client():
+async def test_sinapi_client(http):
     """Test SINAPI client CSV parsing."""
-    from tools.sinapi_client import SINAPIClient
-    from tools.http_utils import CachedHTTPClient
-    import tempfile
-    import csv
 
+    header = "[3] SINAPI client (CSV parsing + BDI)"
     results = []
 
-    # Create a test CSV
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".csv", delete=False,
-        encoding="latin-1",
-    ) as f:
-        writer = csv.writer(f, delimiter=";")
-        writer.writerow([
-            "CODIGO", "DESCRICAO", "UNIDADE", "PRECO UNITARIO"
-        ])
-        writer.writerow([
-            "87529", "PINTURA LATEX PVA", "M2", "12,50"
-        ])
-        writer.writerow([
-            "87878", "PISO CERAMICO", "M2", "45,30"
-        ])
-        writer.writerow([
-            "93358", "ELETRODUTO PVC", "M", "8,75"
-        ])
-        tmp_path = f.name
-
-    http = CachedHTTPClient()
     client = SINAPIClient(estado="MG", http=http)
-    client.load_from_csv(tmp_path)
+    client.load_from_stream(io.StringIO(_SINAPI_CSV))
 
     # T6: CSV loaded correctly
     comp = client.get_composicao("87529")
@@ -170,9 +240,9 @@ async def test_sinapi_client():
             f"comp={comp}",
         ))
 
-    # T7: search by description
+    # T7: search by description (set compare: one pass, no len+index)
     found = client.search_composicoes("PISO")
-    if len(found) == 1 and found[0].codigo == "87878":
+    if {c.codigo for c in found} == {"87878"}:
         results.append(result_line(
             "T7-sinapi-search", PASS,
         ))
@@ -198,51 +268,17 @@ async def test_sinapi_client():
             f"expected {expected_sub}, got {bdi_result['subtotal']}",
         ))
 
-    os.unlink(tmp_path)
-    await http.close()
-    return results
+    return header, results
 
 
-async def test_bps_client():
+async def test_bps_client(http):
     """Test BPS client CSV parsing and CMED verification."""
-    from tools.bps_client import BPSClient, CMEDPreco
-    from tools.http_utils import CachedHTTPClient
-    import tempfile
-    import csv
 
+    header = "[4] BPS/CMED client (search + ceiling)"
     results = []
-    http = CachedHTTPClient()
     client = BPSClient(http=http)
 
-    # Create test BPS CSV
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".csv", delete=False,
-        encoding="utf-8",
-    ) as f:
-        writer = csv.writer(f, delimiter=";")
-        writer.writerow([
-            "MEDICAMENTO", "APRESENTACAO", "PRINCIPIO_ATIVO",
-            "PRECO_UNITARIO", "ORGAO", "UF", "DATA_COMPRA",
-            "QUANTIDADE", "MODALIDADE",
-        ])
-        writer.writerow([
-            "RISPERIDONA 2MG", "COMPRIMIDO", "RISPERIDONA",
-            "0,15", "PREF EXEMPLO", "MG", "2025-06-15",
-            "5000", "PREGAO",
-        ])
-        writer.writerow([
-            "RISPERIDONA 2MG", "COMPRIMIDO", "RISPERIDONA",
-            "0,18", "SEC SAUDE", "SP", "2025-07-10",
-            "10000", "PREGAO",
-        ])
-        writer.writerow([
-            "RISPERIDONA 2MG", "COMPRIMIDO", "RISPERIDONA",
-            "0,12", "HOSPITAL X", "MG", "2025-08-01",
-            "3000", "PREGAO",
-        ])
-        bps_path = f.name
-
-    client.load_bps_csv(bps_path)
+    client.load_bps_stream(io.StringIO(_BPS_CSV))
 
     # T9: BPS search returns summary
     resumo = client.search_bps("RISPERIDONA")
@@ -305,13 +341,25 @@ async def test_bps_client():
             str(check2),
         ))
 
-    os.unlink(bps_path)
-    await http.close()
-    return results
+    return header, results
+
+
+async def _run_hook(args, input_bytes=None, env=None):
+    """Spawn a hook script without blocking the event loop."""
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, *args,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+    )
+    out, err = await proc.communicate(input=input_bytes)
+    return proc.returncode, out, err
 
 
-def test_hook_validate_document():
+async def test_hook_validate_document():
     """Test the validate_document hook script."""
+    header = "[5] Hook: validate_document"
     results = []
     hook = PROJECT_ROOT / ".claude" / "hooks" / "validate_document.py"
 
@@ -331,24 +379,44 @@ Teste
 
 [Fonte: BR-FED-0001 | Lei 14.133/2021 | Art. 18 | Vigente]
 """
-    r = subprocess.run(
-        [sys.executable, str(hook), "--type", "etp"],
-        input=etp_content, capture_output=True, text=True,
-    )
-    if r.returncode == 0:
+    # T14: Invalid ETP (missing sections) fails
+    bad_etp = "# Some random content\nNo sections here.\n"
+
+    if _SUBPROCESS_HOOKS:
+        # Integration path: exercise the real CLI entry points.
+        # Both invocations are independent; run them concurrently so
+        # the group pays one interpreter cold-start, not two.
+        (rc_ok, out_ok, err_ok), (rc_bad, _, _) = (
+            await asyncio.gather(
+                _run_hook(
+                    [str(hook), "--type", "etp"],
+                    etp_content.encode(),
+                ),
+                _run_hook(
+                    [str(hook), "--type", "etp"],
+                    bad_etp.encode(),
+                ),
+            )
+        )
+        out_ok = (out_ok + err_ok).decode()
+    else:
+        # Default: call the validators in-process, skipping the
+        # interpreter cold-start entirely.
+        mod = _load_hook_module("validate_document")
+        res_ok = mod.validate_etp(etp_content)
+        res_bad = mod.validate_etp(bad_etp)
+        rc_ok = 0 if res_ok["valid"] else 1
+        rc_bad = 0 if res_bad["valid"] else 1
+        out_ok = "; ".join(res_ok["errors"])
+
+    if rc_ok == 0:
         results.append(result_line("T13-hook-valid-etp", PASS))
     else:
         results.append(result_line(
-            "T13-hook-valid-etp", FAIL, r.stdout + r.stderr,
+            "T13-hook-valid-etp", FAIL, out_ok,
         ))
 
-    # T14: Invalid ETP (missing sections) fails
-    bad_etp = "# Some random content\nNo sections here.\n"
-    r = subprocess.run(
-        [sys.executable, str(hook), "--type", "etp"],
-        input=bad_etp, capture_output=True, text=True,
-    )
-    if r.returncode != 0:
+    if rc_bad != 0:
         results.append(result_line("T14-hook-invalid-etp", PASS))
     else:
         results.append(result_line(
@@ -356,56 +424,55 @@ Teste
             "should have failed",
         ))
 
-    return results
+    return header, results
 
 
-def test_hook_check_citation():
+async def test_hook_check_citation():
     """Test the check_citation hook script."""
+    header = "[6] Hook: check_citation"
     results = []
     hook = PROJECT_ROOT / ".claude" / "hooks" / "check_citation.py"
 
-    # Create temp file with valid citations
-    import tempfile
     content = (
         "Conforme o Art. 18 da Lei 14.133/2021\n"
         "[Fonte: BR-FED-0001 | Lei 14.133/2021 | Art. 18 | Vigente]\n"
     )
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".md", delete=False,
-    ) as f:
-        f.write(content)
-        tmp = f.name
-
-    r = subprocess.run(
-        [sys.executable, str(hook), "--file", tmp],
-        capture_output=True, text=True,
-        env={
-            **os.environ,
-            "SOURCES_LOG": str(
-                PROJECT_ROOT / "sources" / "sources_log.jsonl"
-            ),
-            "PRICE_SOURCES_LOG": str(
-                PROJECT_ROOT / "sources" / "price_sources_log.jsonl"
-            ),
-        },
-    )
-    if r.returncode == 0:
+
+    if _SUBPROCESS_HOOKS:
+        # Integration path via CLI; mkstemp gives a bare fd + path
+        # without the NamedTemporaryFile wrapper machinery.
+        fd, tmp = tempfile.mkstemp(suffix=".md")
+        os.write(fd, content.encode())
+        os.close(fd)
+        rc, out, err = await _run_hook(
+            [str(hook), "--file", tmp],
+        )
+        detail = (out + err).decode()
+        os.unlink(tmp)
+    else:
+        mod = _load_hook_module("check_citation")
+        valid_sources = mod.load_valid_sources(
+            os.environ["SOURCES_LOG"],
+            os.environ["PRICE_SOURCES_LOG"],
+        )
+        report = mod.check_citations(content, valid_sources)
+        rc = 0 if report["valid"] else 1
+        detail = str(report["invalid_citations"])
+
+    if rc == 0:
         results.append(result_line(
             "T15-hook-citation-valid", PASS,
         ))
     else:
         results.append(result_line(
-            "T15-hook-citation-valid", FAIL,
-            r.stdout + r.stderr,
+            "T15-hook-citation-valid", FAIL, detail,
         ))
 
-    os.unlink(tmp)
-    return results
+    return header, results
 
 
 def test_http_utils():
     """Test HTTP utilities (cache, credentials)."""
-    from tools.http_utils import TTLCache, load_credentials
 
     results = []
 
@@ -440,44 +507,16 @@ def test_http_utils():
     return results
 
 
-async def test_anp_client():
+async def test_anp_client(http):
     """Test ANP client CSV parsing and search."""
-    from tools.anp_client import ANPClient
-    from tools.http_utils import CachedHTTPClient
-    import tempfile
 
+    header = "[8] ANP client"
     results = []
 
-    # Create test CSV with ANP-style data
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".csv", delete=False,
-        encoding="latin-1",
-    ) as f:
-        writer = csv.writer(f, delimiter=";")
-        writer.writerow([
-            "COMBUSTIVEL", "MUNICIPIO", "ESTADO",
-            "PRECO_REVENDA", "BANDEIRA", "DATA_COLETA",
-            "NOME_POSTO",
-        ])
-        writer.writerow([
-            "GASOLINA COMUM", "EXTREMA", "MG",
-            "5,89", "BRANCA", "2026-01-25", "POSTO A",
-        ])
-        writer.writerow([
-            "GASOLINA COMUM", "EXTREMA", "MG",
-            "5,95", "SHELL", "2026-01-25", "POSTO B",
-        ])
-        writer.writerow([
-            "DIESEL S10", "EXTREMA", "MG",
-            "6,15", "BRANCA", "2026-01-25", "POSTO C",
-        ])
-        tmp_path = f.name
-
-    http = CachedHTTPClient()
     client = ANPClient(
         municipio="EXTREMA", estado="MG", http=http,
     )
-    client.load_from_csv(tmp_path)
+    client.load_from_stream(io.StringIO(_ANP_CSV))
 
     # T19: CSV loaded correctly
     if client._loaded and len(client._registros) == 3:
@@ -494,7 +533,7 @@ async def test_anp_client():
     postos = client.search_postos(
         "GASOLINA COMUM", "EXTREMA",
     )
-    if len(postos) == 2:
+    if {p.nome_posto for p in postos} == {"POSTO A", "POSTO B"}:
         results.append(result_line(
             "T20-anp-search", PASS,
         ))
@@ -520,44 +559,17 @@ async def test_anp_client():
             "T21-anp-price-summary", FAIL,
         ))
 
-    os.unlink(tmp_path)
-    await http.close()
-    return results
+    return header, results
 
 
-async def test_sicro_client():
+async def test_sicro_client(http):
     """Test SICRO client CSV parsing and search."""
-    from tools.sicro_client import SICROClient
-    from tools.http_utils import CachedHTTPClient
-    import tempfile
 
+    header = "[9] SICRO client"
     results = []
 
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".csv", delete=False,
-        encoding="latin-1",
-    ) as f:
-        writer = csv.writer(f, delimiter=";")
-        writer.writerow([
-            "CODIGO", "DESCRICAO", "UNIDADE",
-            "PRECO UNITARIO",
-        ])
-        writer.writerow([
-            "5914242", "ESCAVACAO MECANICA", "M3", "8,45",
-        ])
-        writer.writerow([
-            "4011631", "TRANSPORTE LOCAL MATERIAL",
-            "TKM", "1,20",
-        ])
-        writer.writerow([
-            "5914315", "COMPACTACAO DE ATERRO",
-            "M3", "5,60",
-        ])
-        tmp_path = f.name
-
-    http = CachedHTTPClient()
     client = SICROClient(estado="MG", http=http)
-    client.load_from_csv(tmp_path)
+    client.load_from_stream(io.StringIO(_SICRO_CSV))
 
     # T22: CSV loaded
     comp = client.get_composicao("5914242")
@@ -573,7 +585,7 @@ async def test_sicro_client():
 
     # T23: search by description
     found = client.search_composicoes("COMPACTACAO")
-    if len(found) == 1 and found[0].codigo == "5914315":
+    if {c.codigo for c in found} == {"5914315"}:
         results.append(result_line(
             "T23-sicro-search", PASS,
         ))
@@ -598,20 +610,14 @@ async def test_sicro_client():
             "T24-sicro-structure", FAIL,
         ))
 
-    os.unlink(tmp_path)
-    await http.close()
-    return results
+    return header, results
 
 
-async def test_e2e_workflows():
+async def test_e2e_workflows(tools):
     """End-to-end workflow tests."""
-    from tools.procurement_mcp_server import ProcurementTools
-    from tools.sinapi_client import SINAPIClient
-    from tools.sicro_client import SICROClient
-    from tools.anp_client import ANPClient
 
+    header = "[10] End-to-end workflows"
     results = []
-    tools = ProcurementTools()
 
     # T25: Multi-source clients are all instantiated
     has_sinapi = isinstance(tools.sinapi, SINAPIClient)
@@ -654,27 +660,15 @@ async def test_e2e_workflows():
             "T26-citation-round-trip", FAIL, str(r),
         ))
 
-    # T27: Audit logging works
-    from tools.logging_config import audit_log, AUDIT_LOG_PATH
-    import tempfile
+    # T27: Audit logging works (in-memory sink, no tempfile)
     import json as _json
 
-    # Use a temp file to avoid polluting real logs
-    old_path = AUDIT_LOG_PATH
-    tmp = tempfile.NamedTemporaryFile(
-        suffix=".jsonl", delete=False,
-    )
-    tmp.close()
-    import tools.logging_config as lc
-    lc.AUDIT_LOG_PATH = Path(tmp.name)
-
+    sink = io.StringIO()
     audit_log(
         "test_tool", {"key": "val"}, {"success": True}, 1.5,
+        sink=sink,
     )
-
-    content = Path(tmp.name).read_text()
-    lc.AUDIT_LOG_PATH = old_path
-    os.unlink(tmp.name)
+    content = sink.getvalue()
 
     try:
         entry = _json.loads(content.strip())
@@ -694,11 +688,27 @@ async def test_e2e_workflows():
             "T27-audit-logging", FAIL, str(exc),
         ))
 
-    await tools.close()
-    return results
+    return header, results
 
 
 async def main():
+    parser = argparse.ArgumentParser(
+        description="Run the procurement system evaluation suite.",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="stop reporting after the first failing group",
+    )
+    parser.add_argument(
+        "--subprocess-hooks",
+        action="store_true",
+        help="exercise hook scripts via subprocess (CLI entry points)",
+    )
+    args = parser.parse_args()
+    global _SUBPROCESS_HOOKS
+    _SUBPROCESS_HOOKS = args.subprocess_hooks
+
     print("=" * 60)
     print("Procurement System -- Evaluation Runner")
     print("=" * 60)
@@ -706,50 +716,61 @@ async def main():
 
     all_results = []
 
-    print("[1] Source loading and validation")
-    all_results.extend(await test_source_loading())
-    print()
-
-    print("[2] PNCP client")
-    all_results.extend(await test_pncp_client())
-    print()
-
-    print("[3] SINAPI client (CSV parsing + BDI)")
-    all_results.extend(await test_sinapi_client())
-    print()
-
-    print("[4] BPS/CMED client (search + ceiling)")
-    all_results.extend(await test_bps_client())
-    print()
-
-    print("[5] Hook: validate_document")
-    all_results.extend(test_hook_validate_document())
-    print()
-
-    print("[6] Hook: check_citation")
-    all_results.extend(test_hook_check_citation())
-    print()
-
-    print("[7] HTTP utilities (cache, credentials)")
-    all_results.extend(test_http_utils())
-    print()
-
-    print("[8] ANP client")
-    all_results.extend(await test_anp_client())
-    print()
-
-    print("[9] SICRO client")
-    all_results.extend(await test_sicro_client())
-    print()
-
-    print("[10] End-to-end workflows")
-    all_results.extend(await test_e2e_workflows())
-    print()
-
-    # Summary
-    passed = all_results.count(PASS)
-    failed = all_results.count(FAIL)
-    skipped = all_results.count(SKIP)
+    # Shared fixtures: one HTTP client (connection pool + TTL cache)
+    # and one ProcurementTools (single JSONL source parse) serve every
+    # group instead of each group building its own.
+    # The async groups are independent (each owns its temp files and
+    # per-test state), so they run concurrently; wall-clock is bounded
+    # by the slowest group instead of the sum. Headers are printed in
+    # declared order once every group has finished.
+    async with CachedHTTPClient() as http:
+        tools = ProcurementTools(http=http)
+        async_groups = await asyncio.gather(
+            test_source_loading(tools),
+            test_pncp_client(http),
+            test_sinapi_client(http),
+            test_bps_client(http),
+            test_hook_validate_document(),
+            test_hook_check_citation(),
+            test_anp_client(http),
+            test_sicro_client(http),
+            test_e2e_workflows(tools),
+        )
+    groups = list(async_groups)
+
+    # Emit all buffered lines in declared order with a single write.
+    # With --fail-fast, stop at the first group containing a FAIL
+    # (the remaining sync group is then skipped entirely).
+    out_lines = []
+    aborted = False
+    for header, results in groups:
+        out_lines.append(header)
+        for status, line in results:
+            all_results.append(status)
+            out_lines.append(line)
+        out_lines.append("")
+        if args.fail_fast and FAIL in [s for s, _ in results]:
+            out_lines.append("(--fail-fast: remaining groups skipped)")
+            out_lines.append("")
+            aborted = True
+            break
+
+    if not aborted:
+        header = "[7] HTTP utilities (cache, credentials)"
+        results = test_http_utils()
+        out_lines.append(header)
+        for status, line in results:
+            all_results.append(status)
+            out_lines.append(line)
+        out_lines.append("")
+
+    sys.stdout.write("\n".join(out_lines) + "\n")
+
+    # Summary (single pass over the statuses)
+    counts = Counter(all_results)
+    passed = counts[PASS]
+    failed = counts[FAIL]
+    skipped = counts[SKIP]
     total = len(all_results)
 
     print("=" * 60)
@@ -765,5 +786,12 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop e opcional; quando instalado, substitui o event loop
+    # padrao com ganho direto nos grupos de teste com rede.
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     code = asyncio.run(main())
     sys.exit(code)
@@ -1,9 +1,38 @@
 # Procurement tools package
-from tools.http_utils import CachedHTTPClient, HTTPError
-from tools.pncp_client import PNCPClient
-from tools.sinapi_client import SINAPIClient
-from tools.bps_client import BPSClient
-from tools.anp_client import ANPClient
-from tools.sicro_client import SICROClient
-from tools.procurement_mcp_server import ProcurementTools
-from tools.pdf_processor import PDFProcessor
+#
+# Imports sao resolvidos sob demanda (PEP 562): cada submodulo so e
+# carregado no primeiro acesso ao atributo, em vez de arrastar todos
+# os clientes (e suas dependencias) em todo `import tools`.
+import importlib
+
+_LAZY = {
+    "CachedHTTPClient": "tools.http_utils",
+    "HTTPError": "tools.http_utils",
+    "PNCPClient": "tools.pncp_client",
+    "SINAPIClient": "tools.sinapi_client",
+    "BPSClient": "tools.bps_client",
+    "ANPClient": "tools.anp_client",
+    "SICROClient": "tools.sicro_client",
+    "ProcurementTools": "tools.procurement_mcp_server",
+    "PDFProcessor": "tools.pdf_processor",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    value = getattr(
+        importlib.import_module(module_name), name
+    )
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -12,9 +12,11 @@ https://www.gov.br/anp/pt-br/assuntos/precos-e-defesa-da-concorrencia/precos/
 import csv
 import logging
 import os
-import re
+import pickle
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -35,8 +37,22 @@ ANP_CACHE_DIR = Path(
     os.environ.get("ANP_CACHE_DIR", "data/anp")
 )
 
+# Normalizacao de preco "1.234,56" -> "1234.56" em uma passada
+_PRECO_TABLE = str.maketrans({".": "", ",": "."})
 
-@dataclass
+
+@lru_cache(maxsize=64)
+def _api_params(municipio: str, estado: str) -> dict:
+    """Parametros normalizados da consulta ANP, memoizados por
+    (municipio, estado) para que chamadas repetidas reutilizem o
+    mesmo dict (e a mesma chave no cache TTL do cliente HTTP)."""
+    return {
+        "municipio": municipio.upper(),
+        "estado": estado.upper(),
+    }
+
+
+@dataclass(slots=True, frozen=True)
 class ANPPreco:
     """Registro individual de preco de combustivel da ANP."""
 
@@ -49,7 +65,7 @@ class ANPPreco:
     nome_posto: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ANPResumo:
     """Resumo estatistico de precos ANP."""
 
@@ -82,6 +98,13 @@ class ANPClient:
         self.estado = estado.upper()
         self.http = http or CachedHTTPClient()
         self._registros: list[ANPPreco] = []
+        # Colunas derivadas para os caminhos quentes de consulta
+        # (combustivel casefolded, municipio e preco), reconstruidas
+        # a cada carga.
+        self._cf_combust: list[str] = []
+        self._municipios: list[str] = []
+        self._precos: list[float] = []
+        self._trigrams: dict[str, set[int]] = {}
         self._loaded = False
 
     def load_from_csv(self, csv_path: str | Path):
@@ -92,6 +115,10 @@ class ANPClient:
         COMBUSTIVEL, MUNICIPIO, ESTADO, PRECO_REVENDA,
         BANDEIRA, DATA_COLETA, NOME_POSTO.
 
+        Um sidecar serializado (.pkl) e mantido ao lado do CSV:
+        se estiver mais novo que o CSV, os registros ja parseados
+        sao recarregados direto dele, pulando o parsing.
+
         Args:
             csv_path: Caminho para o arquivo CSV
         """
@@ -100,72 +127,186 @@ class ANPClient:
             logger.warning("CSV not found: %s", path)
             return
 
-        self._registros = []
-        with path.open(encoding="latin-1") as fh:
-            reader = csv.DictReader(fh, delimiter=";")
-            for row in reader:
-                combustivel = (
-                    row.get("COMBUSTIVEL", "")
-                    or row.get("PRODUTO", "")
-                ).strip()
-                if not combustivel:
-                    continue
-
-                municipio = (
-                    row.get("MUNICIPIO", "")
-                    or row.get("MUNICÍPIO", "")
-                ).strip().upper()
-
-                estado = (
-                    row.get("ESTADO", "")
-                    or row.get("UF", "")
-                ).strip().upper()
-
-                preco_str = (
-                    row.get("PRECO_REVENDA", "")
-                    or row.get("PRECO REVENDA", "")
-                    or row.get("VALOR DE VENDA", "")
-                ).strip()
-                preco_str = (
-                    preco_str.replace(".", "").replace(",", ".")
-                )
-                try:
-                    preco = float(preco_str) if preco_str else 0.0
-                except ValueError:
-                    preco = 0.0
-
-                bandeira = (
-                    row.get("BANDEIRA", "")
-                ).strip()
-
-                data_coleta = (
-                    row.get("DATA_COLETA", "")
-                    or row.get("DATA COLETA", "")
-                    or row.get("DATA DA COLETA", "")
-                ).strip()
-
-                nome_posto = (
-                    row.get("NOME_POSTO", "")
-                    or row.get("REVENDA", "")
-                    or row.get("NOME POSTO", "")
-                ).strip()
-
-                self._registros.append(ANPPreco(
-                    combustivel=combustivel,
-                    municipio=municipio,
-                    estado=estado,
-                    preco_revenda=preco,
-                    bandeira=bandeira,
-                    data_coleta=data_coleta,
-                    nome_posto=nome_posto,
-                ))
+        sidecar = path.with_suffix(".pkl")
+        if self._load_sidecar(sidecar, path):
+            return
 
-        self._loaded = True
+        with path.open(encoding="latin-1") as fh:
+            self.load_from_stream(fh)
+        self._write_sidecar(sidecar)
         logger.info(
             "Loaded %d ANP records from %s",
             len(self._registros), path,
         )
 
+    def _load_sidecar(
+        self, sidecar: Path, csv_path: Path
+    ) -> bool:
+        """Tenta recarregar registros do sidecar serializado."""
+        try:
+            if (
+                not sidecar.exists()
+                or sidecar.stat().st_mtime
+                < csv_path.stat().st_mtime
+            ):
+                return False
+            with sidecar.open("rb") as fh:
+                self._registros = pickle.load(fh)
+        except (OSError, pickle.PickleError, EOFError) as exc:
+            logger.warning(
+                "Ignoring ANP sidecar %s: %s", sidecar, exc
+            )
+            return False
+        self._rebuild_columns()
+        self._loaded = True
+        logger.info(
+            "Loaded %d ANP records from sidecar %s",
+            len(self._registros), sidecar,
+        )
+        return True
+
+    def _write_sidecar(self, sidecar: Path):
+        """Serializa os registros parseados para o sidecar."""
+        try:
+            with sidecar.open("wb") as fh:
+                pickle.dump(
+                    self._registros,
+                    fh,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+        except (OSError, pickle.PickleError) as exc:
+            logger.warning(
+                "Could not write ANP sidecar %s: %s",
+                sidecar, exc,
+            )
+
+    def load_from_stream(self, stream):
+        """
+        Carrega registros a partir de um stream CSV ja aberto.
+
+        Aceita qualquer objeto file-like (arquivo, io.StringIO),
+        evitando disco quando os dados ja estao em memoria.
+
+        Args:
+            stream: Objeto file-like com conteudo CSV
+        """
+        self._registros = []
+        # csv.reader devolve tuplas do parser em C; os indices das
+        # colunas (com seus apelidos) sao resolvidos uma unica vez a
+        # partir do header, em vez de sondar um dict por linha.
+        reader = csv.reader(stream, delimiter=";")
+        header = next(reader, None)
+        if header is None:
+            self._rebuild_columns()
+            self._loaded = True
+            return
+        idx = {
+            h.strip().upper(): i for i, h in enumerate(header)
+        }
+
+        def _col(*names: str) -> int:
+            for name in names:
+                if name in idx:
+                    return idx[name]
+            return -1
+
+        i_comb = _col("COMBUSTIVEL", "PRODUTO")
+        i_mun = _col("MUNICIPIO", "MUNICÍPIO")
+        i_uf = _col("ESTADO", "UF")
+        i_preco = _col(
+            "PRECO_REVENDA", "PRECO REVENDA", "VALOR DE VENDA"
+        )
+        i_band = _col("BANDEIRA")
+        i_data = _col(
+            "DATA_COLETA", "DATA COLETA", "DATA DA COLETA"
+        )
+        i_posto = _col("NOME_POSTO", "REVENDA", "NOME POSTO")
+
+        def _get(row: list, i: int) -> str:
+            return row[i] if 0 <= i < len(row) else ""
+
+        # Canonicalizacao: combustivel/municipio/estado/bandeira vem
+        # de dominios minusculos, entao valores logicamente iguais
+        # compartilham o mesmo objeto str em vez de uma alocacao por
+        # linha.
+        _atoms: dict[str, str] = {}
+
+        def _canon(s: str) -> str:
+            return _atoms.setdefault(s, s)
+
+        for row in reader:
+            combustivel = _get(row, i_comb).strip()
+            if not combustivel:
+                continue
+            combustivel = _canon(combustivel)
+
+            municipio = _canon(
+                _get(row, i_mun).strip().upper()
+            )
+            estado = _canon(_get(row, i_uf).strip().upper())
+
+            preco_str = (
+                _get(row, i_preco).strip()
+                .translate(_PRECO_TABLE)
+            )
+            try:
+                preco = float(preco_str) if preco_str else 0.0
+            except ValueError:
+                preco = 0.0
+
+            bandeira = _canon(_get(row, i_band).strip())
+            data_coleta = _canon(_get(row, i_data).strip())
+            nome_posto = _get(row, i_posto).strip()
+
+            self._registros.append(ANPPreco(
+                combustivel=combustivel,
+                municipio=municipio,
+                estado=estado,
+                preco_revenda=preco,
+                bandeira=bandeira,
+                data_coleta=data_coleta,
+                nome_posto=nome_posto,
+            ))
+
+        self._rebuild_columns()
+        self._loaded = True
+
+    def _rebuild_columns(self):
+        """Reconstroi as colunas derivadas apos uma carga.
+
+        Manter listas paralelas por coluna permite que as consultas
+        percorram apenas os campos que usam, em vez de tocar cada
+        dataclass inteira.
+        """
+        regs = self._registros
+        self._cf_combust = [r.combustivel.casefold() for r in regs]
+        self._municipios = [r.municipio for r in regs]
+        self._precos = [r.preco_revenda for r in regs]
+        # Indice invertido de trigramas sobre o combustivel: cada
+        # consulta vira uma intersecao de postings + verificacao de
+        # substring nos candidatos, em vez de varrer todas as linhas.
+        trigrams: dict[str, set[int]] = defaultdict(set)
+        for i, cf in enumerate(self._cf_combust):
+            for j in range(len(cf) - 2):
+                trigrams[cf[j:j + 3]].add(i)
+        self._trigrams = dict(trigrams)
+
+    def _candidate_indexes(self, term_cf: str):
+        """Indices candidatos para um termo casefolded.
+
+        Com 3+ caracteres usa o indice de trigramas; termos curtos
+        caem na varredura completa.
+        """
+        if len(term_cf) < 3:
+            return range(len(self._cf_combust))
+        postings = [
+            self._trigrams.get(term_cf[j:j + 3])
+            for j in range(len(term_cf) - 2)
+        ]
+        if any(p is None for p in postings):
+            return ()
+        return sorted(set.intersection(*postings))
+
     async def ensure_loaded(self):
         """
         Ensure data is loaded. Tries local cache first,
@@ -174,12 +315,17 @@ class ANPClient:
         if self._loaded:
             return
 
-        # Try local cache directory
+        # Try local cache directory: pick the newest weekly CSV in
+        # one O(N) pass instead of sorting the whole listing.
         cache_dir = ANP_CACHE_DIR
         if cache_dir.exists():
-            csvs = sorted(cache_dir.glob("*.csv"), reverse=True)
-            if csvs:
-                self.load_from_csv(csvs[0])
+            latest = max(
+                cache_dir.glob("*.csv"),
+                key=lambda p: p.name,
+                default=None,
+            )
+            if latest is not None:
+                self.load_from_csv(latest)
                 return
 
         # Try downloading via API
@@ -202,10 +348,7 @@ class ANPClient:
         try:
             data = await self.http.get_json(
                 ANP_API_BASE,
-                params={
-                    "municipio": municipio,
-                    "estado": estado,
-                },
+                params=_api_params(municipio, estado),
                 cache_ttl=3600,
             )
             if isinstance(data, dict) and data.get(
@@ -229,6 +372,7 @@ class ANPClient:
                         data_coleta=item.get("data", ""),
                         nome_posto=item.get("posto", ""),
                     ))
+                self._rebuild_columns()
                 self._loaded = True
         except Exception as exc:
             logger.warning("ANP API query failed: %s", exc)
@@ -250,17 +394,15 @@ class ANPClient:
         Returns:
             Lista de ANPPreco
         """
-        pattern = re.compile(
-            re.escape(combustivel), re.IGNORECASE
-        )
+        term_cf = combustivel.casefold()
         mun = municipio.upper() if municipio else None
         results: list[ANPPreco] = []
-        for reg in self._registros:
-            if not pattern.search(reg.combustivel):
+        for i in self._candidate_indexes(term_cf):
+            if term_cf not in self._cf_combust[i]:
                 continue
-            if mun and reg.municipio != mun:
+            if mun and self._municipios[i] != mun:
                 continue
-            results.append(reg)
+            results.append(self._registros[i])
             if len(results) >= limite:
                 break
         return results
@@ -280,32 +422,41 @@ class ANPClient:
         Returns:
             ANPResumo ou None se sem dados
         """
-        pattern = re.compile(
-            re.escape(combustivel), re.IGNORECASE
-        )
+        term_cf = combustivel.casefold()
         mun = municipio.upper() if municipio else None
-        precos: list[float] = []
+        # Agregacao em uma unica passada sobre as colunas derivadas:
+        # soma, minimo e maximo acumulados sem lista intermediaria.
+        total = 0.0
+        minimo = float("inf")
+        maximo = 0.0
+        n = 0
         data_coleta = ""
-        for reg in self._registros:
-            if not pattern.search(reg.combustivel):
+        for i, preco in enumerate(self._precos):
+            if preco <= 0:
                 continue
-            if mun and reg.municipio != mun:
+            if term_cf not in self._cf_combust[i]:
                 continue
-            if reg.preco_revenda > 0:
-                precos.append(reg.preco_revenda)
-                if not data_coleta and reg.data_coleta:
-                    data_coleta = reg.data_coleta
-
-        if not precos:
+            if mun and self._municipios[i] != mun:
+                continue
+            total += preco
+            if preco < minimo:
+                minimo = preco
+            if preco > maximo:
+                maximo = preco
+            n += 1
+            if not data_coleta:
+                data_coleta = self._registros[i].data_coleta
+
+        if n == 0:
             return None
 
         return ANPResumo(
             combustivel=combustivel,
             municipio=mun or self.municipio,
             estado=self.estado,
-            media=round(sum(precos) / len(precos), 3),
-            minimo=round(min(precos), 3),
-            maximo=round(max(precos), 3),
-            n_postos=len(precos),
+            media=round(total / n, 3),
+            minimo=round(minimo, 3),
+            maximo=round(maximo, 3),
+            n_postos=n,
             data_coleta=data_coleta,
         )
@@ -13,9 +13,12 @@ URL: https://www.gov.br/anvisa/pt-br/assuntos/medicamentos/cmed
 import csv
 import io
 import logging
+import math
+import mmap
 import os
+import pickle
 import re
-import statistics
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -39,8 +42,78 @@ CMED_CACHE_DIR = Path(
     os.environ.get("CMED_CACHE_DIR", "data/cmed")
 )
 
+# Normalizacao de preco "1.234,56" -> "1234.56" em uma unica
+# passada em C, no lugar de dois str.replace encadeados.
+_PRECO_TABLE = str.maketrans({".": "", ",": "."})
+
+# Abaixo deste tamanho o parse paralelo nao compensa o custo de
+# subir os processos trabalhadores.
+_PARALLEL_MIN_BYTES = 50 * 1024 * 1024
+
+# Dispatch de headers do XLS CMED em uma unica alternacao; o nome
+# do grupo que casar vira a chave em col_map (pmvg_sem antes de
+# pmvg_com para manter a precedencia do encadeamento original).
+_CMED_HEADER_RE = re.compile(
+    r"(?P<substancia>SUBSTANCIA|PRINCIPIO)"
+    r"|(?P<produto>PRODUTO|MEDICAMENTO)"
+    r"|(?P<apresentacao>APRESENTA)"
+    r"|(?P<laboratorio>LABORAT)"
+    r"|(?P<pmvg_sem>PMVG.*SEM)"
+    r"|(?P<pmvg_com>PMVG)"
+    r"|(?P<pf_sem>PF.*SEM)"
+)
+
+
+def _parse_bps_chunk(
+    path: str, start: int, end: int, cols: tuple
+) -> list[tuple]:
+    """Parseia uma faixa de bytes de um CSV BPS (worker).
 
-@dataclass
+    A faixa ja chega alinhada a quebras de linha; devolve tuplas
+    de campos prontos (precos e quantidades convertidos) para o
+    processo principal montar os registros.
+    """
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    text = data.decode("utf-8", errors="replace")
+    reader = csv.reader(io.StringIO(text), delimiter=";")
+    (
+        i_med, i_apres, i_pa, i_preco, i_orgao,
+        i_uf, i_data, i_qtd, i_mod,
+    ) = cols
+
+    def _get(row: list, i: int) -> str:
+        return row[i] if 0 <= i < len(row) else ""
+
+    out = []
+    for row in reader:
+        preco_str = _get(row, i_preco).translate(
+            _PRECO_TABLE
+        )
+        try:
+            preco = float(preco_str)
+        except ValueError:
+            preco = 0.0
+        try:
+            qtd = int(_get(row, i_qtd).strip())
+        except ValueError:
+            qtd = 0
+        out.append((
+            _get(row, i_med).strip(),
+            _get(row, i_apres).strip(),
+            _get(row, i_pa).strip(),
+            preco,
+            _get(row, i_orgao).strip(),
+            _get(row, i_uf).strip(),
+            _get(row, i_data).strip(),
+            qtd,
+            _get(row, i_mod).strip(),
+        ))
+    return out
+
+
+@dataclass(slots=True)
 class BPSPreco:
     """Representa um registro de preco no BPS."""
 
@@ -55,7 +128,7 @@ class BPSPreco:
     modalidade: str
 
 
-@dataclass
+@dataclass(slots=True)
 class BPSResumo:
     """Resumo estatistico de precos no BPS."""
 
@@ -70,7 +143,7 @@ class BPSResumo:
     periodo: str
 
 
-@dataclass
+@dataclass(slots=True)
 class CMEDPreco:
     """Preco maximo de medicamento conforme CMED/ANVISA."""
 
@@ -100,7 +173,28 @@ class BPSClient:
     ):
         self.http = http or CachedHTTPClient()
         self._cmed_data: dict[str, CMEDPreco] = {}
+        # Indices para get_cmed_teto, alimentados na carga:
+        # medicamento normalizado -> chaves (probe exato) e
+        # trigrama -> chaves (caminho fuzzy por substring).
+        self._cmed_by_med: dict[str, list[str]] = {}
+        self._cmed_trigrams: dict[str, set[str]] = {}
+        # Memoiza get_cmed_teto por (medicamento, apresentacao);
+        # invalidado a cada carga da tabela.
+        self._teto_cache: dict[
+            tuple[str, str], Optional[CMEDPreco]
+        ] = {}
         self._bps_data: list[BPSPreco] = []
+        # Indice de trigramas sobre medicamento + principio ativo,
+        # construido na carga; consultas por substring iteram apenas
+        # os candidatos.
+        self._bps_trigrams: dict[str, set[int]] = {}
+        # Colunas derivadas (campos normalizados e precos) para os
+        # caminhos de busca, reconstruidas a cada carga.
+        self._med_lc: list[str] = []
+        self._pa_lc: list[str] = []
+        self._apres_lc: list[str] = []
+        self._uf_up: list[str] = []
+        self._precos: list[float] = []
         self._cmed_loaded = False
         self._bps_loaded = False
 
@@ -108,7 +202,11 @@ class BPSClient:
     # BPS methods
     # ------------------------------------------------------------------
 
-    def load_bps_csv(self, csv_path: str | Path):
+    def load_bps_csv(
+        self,
+        csv_path: str | Path,
+        max_rows: Optional[int] = None,
+    ):
         """
         Carrega registros BPS de um arquivo CSV exportado do portal.
 
@@ -118,6 +216,8 @@ class BPSClient:
 
         Args:
             csv_path: Caminho para o CSV exportado
+            max_rows: Limite de linhas a ingerir (teto de memoria
+                para exports muito grandes)
         """
         path = Path(csv_path)
         if not path.exists():
@@ -125,54 +225,252 @@ class BPSClient:
             return
 
         with path.open(encoding="utf-8") as fh:
-            reader = csv.DictReader(fh, delimiter=";")
-            for row in reader:
-                preco_str = (
-                    row.get("PRECO_UNITARIO", "0")
-                    .replace(".", "")
-                    .replace(",", ".")
-                )
-                try:
-                    preco = float(preco_str)
-                except ValueError:
-                    preco = 0.0
+            self.load_bps_stream(fh, max_rows=max_rows)
+        logger.info(
+            "Loaded %d BPS records from %s",
+            len(self._bps_data), path,
+        )
 
-                qtd_str = row.get("QUANTIDADE", "0").strip()
-                try:
-                    qtd = int(qtd_str)
-                except ValueError:
-                    qtd = 0
-
-                self._bps_data.append(BPSPreco(
-                    medicamento=row.get(
-                        "MEDICAMENTO", ""
-                    ).strip(),
-                    apresentacao=row.get(
-                        "APRESENTACAO", ""
-                    ).strip(),
-                    principio_ativo=row.get(
-                        "PRINCIPIO_ATIVO", ""
-                    ).strip(),
-                    preco_unitario=preco,
-                    orgao_comprador=row.get(
-                        "ORGAO", ""
-                    ).strip(),
-                    uf=row.get("UF", "").strip(),
-                    data_compra=row.get(
-                        "DATA_COMPRA", ""
-                    ).strip(),
-                    quantidade=qtd,
-                    modalidade=row.get(
-                        "MODALIDADE", ""
-                    ).strip(),
-                ))
+    def load_bps_csv_parallel(
+        self,
+        csv_path: str | Path,
+        workers: Optional[int] = None,
+    ):
+        """
+        Carrega um CSV BPS grande parseando faixas em paralelo.
+
+        O arquivo e mapeado em memoria, dividido em faixas de bytes
+        alinhadas a quebras de linha e cada faixa vai para um
+        processo trabalhador; o processo principal so monta os
+        registros e os indices. Arquivos pequenos caem no caminho
+        sequencial de load_bps_csv.
 
+        Args:
+            csv_path: Caminho para o CSV exportado
+            workers: Numero de processos (default: os.cpu_count())
+        """
+        path = Path(csv_path)
+        if not path.exists():
+            logger.warning("BPS CSV not found: %s", path)
+            return
+
+        workers = workers or os.cpu_count() or 1
+        size = path.stat().st_size
+        if size < _PARALLEL_MIN_BYTES or workers <= 1:
+            self.load_bps_csv(path)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with path.open("rb") as fh, mmap.mmap(
+            fh.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            header_end = mm.find(b"\n") + 1
+            if header_end == 0:
+                return
+            header = (
+                mm[:header_end]
+                .decode("utf-8", errors="replace")
+            )
+            idx_map = {
+                h.strip().upper(): i
+                for i, h in enumerate(header.split(";"))
+            }
+            cols = tuple(
+                idx_map.get(name, -1)
+                for name in (
+                    "MEDICAMENTO", "APRESENTACAO",
+                    "PRINCIPIO_ATIVO", "PRECO_UNITARIO",
+                    "ORGAO", "UF", "DATA_COMPRA",
+                    "QUANTIDADE", "MODALIDADE",
+                )
+            )
+
+            # Faixas de bytes alinhadas a proxima quebra de linha
+            step = (size - header_end) // workers
+            ranges = []
+            start = header_end
+            for _ in range(workers - 1):
+                end = mm.find(b"\n", start + step)
+                if end == -1:
+                    break
+                end += 1
+                ranges.append((start, end))
+                start = end
+            if start < size:
+                ranges.append((start, size))
+
+        with ProcessPoolExecutor(
+            max_workers=len(ranges)
+        ) as executor:
+            chunks = executor.map(
+                _parse_bps_chunk,
+                [str(path)] * len(ranges),
+                [r[0] for r in ranges],
+                [r[1] for r in ranges],
+                [cols] * len(ranges),
+            )
+            _atoms: dict[str, str] = {}
+
+            def _canon(s: str) -> str:
+                return _atoms.setdefault(s, s)
+
+            for chunk in chunks:
+                for fields in chunk:
+                    reg = BPSPreco(
+                        medicamento=_canon(fields[0]),
+                        apresentacao=_canon(fields[1]),
+                        principio_ativo=_canon(fields[2]),
+                        preco_unitario=fields[3],
+                        orgao_comprador=_canon(fields[4]),
+                        uf=_canon(fields[5]),
+                        data_compra=_canon(fields[6]),
+                        quantidade=fields[7],
+                        modalidade=_canon(fields[8]),
+                    )
+                    self._bps_data.append(reg)
+
+        self._rebuild_bps_columns()
         self._bps_loaded = True
         logger.info(
-            "Loaded %d BPS records from %s",
-            len(self._bps_data), path,
+            "Loaded %d BPS records from %s "
+            "(%d parallel ranges)",
+            len(self._bps_data), path, len(ranges),
         )
 
+    def load_bps_stream(
+        self, stream, max_rows: Optional[int] = None
+    ):
+        """
+        Carrega registros BPS a partir de um stream CSV ja aberto.
+
+        Aceita qualquer objeto file-like (arquivo, io.StringIO),
+        evitando disco quando os dados ja estao em memoria. O
+        stream e consumido linha a linha; com max_rows a carga
+        para no limite, mantendo o pico de memoria previsivel.
+
+        Args:
+            stream: Objeto file-like com conteudo CSV
+            max_rows: Limite de linhas a ingerir
+        """
+        # csv.reader devolve tuplas do parser em C; os indices das
+        # colunas sao resolvidos uma unica vez a partir do header,
+        # em vez de sondar um dict por linha.
+        reader = csv.reader(stream, delimiter=";")
+        header = next(reader, None)
+        if header is None:
+            self._rebuild_bps_columns()
+            self._bps_loaded = True
+            return
+        idx_map = {
+            h.strip().upper(): i for i, h in enumerate(header)
+        }
+        i_med = idx_map.get("MEDICAMENTO", -1)
+        i_apres = idx_map.get("APRESENTACAO", -1)
+        i_pa = idx_map.get("PRINCIPIO_ATIVO", -1)
+        i_preco = idx_map.get("PRECO_UNITARIO", -1)
+        i_orgao = idx_map.get("ORGAO", -1)
+        i_uf = idx_map.get("UF", -1)
+        i_data = idx_map.get("DATA_COMPRA", -1)
+        i_qtd = idx_map.get("QUANTIDADE", -1)
+        i_mod = idx_map.get("MODALIDADE", -1)
+
+        def _get(row: list, i: int) -> str:
+            return row[i] if 0 <= i < len(row) else ""
+
+        # Canonicalizacao: os campos textuais vem de dominios
+        # pequenos (mesmo medicamento/orgao/UF repetidos em milhares
+        # de linhas), entao valores iguais compartilham o mesmo
+        # objeto str em vez de uma alocacao por linha.
+        _atoms: dict[str, str] = {}
+
+        def _canon(s: str) -> str:
+            return _atoms.setdefault(s, s)
+
+        ingested = 0
+        for row in reader:
+            if max_rows is not None and ingested >= max_rows:
+                logger.warning(
+                    "BPS load truncated at max_rows=%d",
+                    max_rows,
+                )
+                break
+            ingested += 1
+            preco_str = _get(row, i_preco).translate(
+                _PRECO_TABLE
+            )
+            try:
+                preco = float(preco_str)
+            except ValueError:
+                preco = 0.0
+
+            try:
+                qtd = int(_get(row, i_qtd).strip())
+            except ValueError:
+                qtd = 0
+
+            self._bps_data.append(BPSPreco(
+                medicamento=_canon(_get(row, i_med).strip()),
+                apresentacao=_canon(
+                    _get(row, i_apres).strip()
+                ),
+                principio_ativo=_canon(
+                    _get(row, i_pa).strip()
+                ),
+                preco_unitario=preco,
+                orgao_comprador=_canon(
+                    _get(row, i_orgao).strip()
+                ),
+                uf=_canon(_get(row, i_uf).strip()),
+                data_compra=_canon(_get(row, i_data).strip()),
+                quantidade=qtd,
+                modalidade=_canon(_get(row, i_mod).strip()),
+            ))
+
+        self._rebuild_bps_columns()
+        self._bps_loaded = True
+
+    def _rebuild_bps_columns(self):
+        """Reconstroi colunas derivadas e indice apos uma carga.
+
+        Cargas sucessivas acumulam em _bps_data, entao o indice de
+        trigramas e reconstruido daqui junto com as colunas para
+        cobrir a base inteira, nao apenas a ultima carga.
+        """
+        regs = self._bps_data
+        self._med_lc = [r.medicamento.lower() for r in regs]
+        self._pa_lc = [r.principio_ativo.lower() for r in regs]
+        self._apres_lc = [r.apresentacao.lower() for r in regs]
+        self._uf_up = [r.uf.upper() for r in regs]
+        self._precos = [r.preco_unitario for r in regs]
+        trigrams: dict[str, set[int]] = defaultdict(set)
+        for idx, (med, pa) in enumerate(
+            zip(self._med_lc, self._pa_lc)
+        ):
+            text = f"{med} {pa}"
+            for j in range(len(text) - 2):
+                trigrams[text[j:j + 3]].add(idx)
+        self._bps_trigrams = dict(trigrams)
+
+    def _bps_candidates(self, medicamento: str):
+        """Indices candidatos para um termo de busca.
+
+        Com 3+ caracteres interseta os postings dos trigramas do
+        termo — qualquer ocorrencia por substring contem todos os
+        seus trigramas, entao nenhum match e perdido. Termos curtos
+        caem na varredura completa.
+        """
+        term = medicamento.lower()
+        if len(term) < 3:
+            return range(len(self._bps_data))
+        postings = [
+            self._bps_trigrams.get(term[j:j + 3])
+            for j in range(len(term) - 2)
+        ]
+        if any(p is None for p in postings):
+            return ()
+        return sorted(set.intersection(*postings))
+
     def search_bps(
         self,
         medicamento: str,
@@ -192,41 +490,57 @@ class BPSClient:
         Returns:
             BPSResumo com estatisticas de precos ou None
         """
-        pattern = re.compile(
-            re.escape(medicamento), re.IGNORECASE
-        )
-        matches = []
-        for reg in self._bps_data:
-            if not (
-                pattern.search(reg.medicamento)
-                or pattern.search(reg.principio_ativo)
-            ):
+        needle = medicamento.lower()
+        apres_lc = apresentacao.lower() if apresentacao else None
+        uf_up = uf.upper() if uf else None
+        precos = []
+        # Filtros mais baratos (e mais seletivos) primeiro; o teste
+        # de substring so roda no residuo.
+        for i in self._bps_candidates(medicamento):
+            if uf_up and self._uf_up[i] != uf_up:
                 continue
-            if apresentacao and apresentacao.lower() not in reg.apresentacao.lower():
+            if apres_lc and apres_lc not in self._apres_lc[i]:
                 continue
-            if uf and reg.uf.upper() != uf.upper():
+            if (
+                needle not in self._med_lc[i]
+                and needle not in self._pa_lc[i]
+            ):
                 continue
-            matches.append(reg)
+            preco = self._precos[i]
+            if preco > 0:
+                precos.append(preco)
 
-        if not matches:
-            return None
-
-        precos = [r.preco_unitario for r in matches if r.preco_unitario > 0]
         if not precos:
             return None
 
+        # Agregacao manual: uma passada para soma/soma de quadrados
+        # e um sort em C para a mediana, evitando as rotinas puras
+        # em Python do modulo de estatistica da stdlib.
+        n = len(precos)
+        total = sum(precos)
+        total_sq = sum(p * p for p in precos)
+        media = total / n
+        if n > 1:
+            variancia = (total_sq - n * media * media) / (n - 1)
+            desvio = math.sqrt(max(variancia, 0.0))
+        else:
+            desvio = 0.0
+        precos.sort()
+        meio = n // 2
+        if n % 2:
+            mediana = precos[meio]
+        else:
+            mediana = (precos[meio - 1] + precos[meio]) / 2
+
         return BPSResumo(
             medicamento=medicamento,
             apresentacao=apresentacao or "",
-            media=round(statistics.mean(precos), 4),
-            mediana=round(statistics.median(precos), 4),
-            minimo=round(min(precos), 4),
-            maximo=round(max(precos), 4),
-            desvio_padrao=round(
-                statistics.stdev(precos) if len(precos) > 1 else 0.0,
-                4,
-            ),
-            n_registros=len(precos),
+            media=round(media, 4),
+            mediana=round(mediana, 4),
+            minimo=round(precos[0], 4),
+            maximo=round(precos[-1], 4),
+            desvio_padrao=round(desvio, 4),
+            n_registros=n,
             periodo=f"ultimos {periodo_meses} meses",
         )
 
@@ -247,19 +561,18 @@ class BPSClient:
         Returns:
             Lista de BPSPreco
         """
-        pattern = re.compile(
-            re.escape(medicamento), re.IGNORECASE
-        )
+        needle = medicamento.lower()
+        apres_lc = apresentacao.lower() if apresentacao else None
         results: list[BPSPreco] = []
-        for reg in self._bps_data:
-            if not (
-                pattern.search(reg.medicamento)
-                or pattern.search(reg.principio_ativo)
-            ):
+        for i in self._bps_candidates(medicamento):
+            if apres_lc and apres_lc not in self._apres_lc[i]:
                 continue
-            if apresentacao and apresentacao.lower() not in reg.apresentacao.lower():
+            if (
+                needle not in self._med_lc[i]
+                and needle not in self._pa_lc[i]
+            ):
                 continue
-            results.append(reg)
+            results.append(self._bps_data[i])
             if len(results) >= limite:
                 break
         return results
@@ -284,70 +597,129 @@ class BPSClient:
             logger.warning("CMED CSV not found: %s", path)
             return
 
+        sidecar = path.with_suffix(".pkl")
+        if self._load_cmed_sidecar(sidecar, path):
+            return
+
+        # Deteccao de encoding pelos primeiros 4 KB, sem ler o
+        # arquivo inteiro duas vezes; descarta os ultimos bytes da
+        # amostra para nao cortar uma sequencia multibyte ao meio.
+        # A amostra e so o caminho rapido: um arquivo latin-1 cujo
+        # inicio e ASCII limpo ainda falha no meio da iteracao, e
+        # nesse caso o parse recomeca em latin-1.
         encoding = "utf-8"
+        with path.open("rb") as fh:
+            sample = fh.read(4096)
         try:
-            path.read_text(encoding="utf-8")
+            sample[: len(sample) - 3 or None].decode("utf-8")
         except UnicodeDecodeError:
             encoding = "latin-1"
 
-        with path.open(encoding=encoding) as fh:
-            reader = csv.DictReader(fh, delimiter=";")
-            for row in reader:
-                substancia = (
-                    row.get("SUBSTANCIA", "")
-                    or row.get("PRINCIPIO_ATIVO", "")
-                ).strip()
-                produto = (
-                    row.get("PRODUTO", "")
-                    or row.get("MEDICAMENTO", "")
-                ).strip()
-                apresentacao = (
-                    row.get("APRESENTACAO", "")
-                ).strip()
-
-                def _parse_price(key):
-                    v = row.get(key, "0").strip()
-                    v = v.replace(".", "").replace(",", ".")
-                    try:
-                        return float(v)
-                    except ValueError:
-                        return 0.0
-
-                entry = CMEDPreco(
-                    medicamento=f"{substancia} - {produto}",
-                    apresentacao=apresentacao,
-                    laboratorio=row.get(
-                        "LABORATORIO", ""
-                    ).strip(),
-                    pf_sem_impostos=_parse_price(
-                        "PF_SEM_IMPOSTOS"
-                    ),
-                    pmvg_sem_impostos=_parse_price(
-                        "PMVG_SEM_IMPOSTOS"
-                    ),
-                    pmvg_com_impostos=_parse_price(
-                        "PMVG_COM_IMPOSTOS"
-                    ),
-                    lista_concessao=row.get(
-                        "LISTA_CONCESSAO", ""
-                    ).strip(),
-                    data_publicacao=row.get(
-                        "DATA_PUBLICACAO",
-                        datetime.now().strftime("%Y-%m-%d"),
-                    ).strip(),
-                )
-
-                key = self._cmed_key(
-                    substancia or produto, apresentacao
-                )
-                self._cmed_data[key] = entry
+        try:
+            with path.open(encoding=encoding) as fh:
+                self._parse_cmed_stream(fh)
+        except UnicodeDecodeError:
+            logger.warning(
+                "CMED CSV %s is not valid UTF-8 past the "
+                "sampled prefix; re-parsing as latin-1", path,
+            )
+            with path.open(encoding="latin-1") as fh:
+                self._parse_cmed_stream(fh)
 
         self._cmed_loaded = True
+        self._teto_cache.clear()
+        self._write_cmed_sidecar(sidecar)
         logger.info(
             "Loaded %d CMED entries from %s",
             len(self._cmed_data), path,
         )
 
+    def _parse_cmed_stream(self, fh):
+        """Parseia um stream CSV CMED ja aberto.
+
+        Re-executavel: re-parsear o mesmo conteudo apenas
+        sobrescreve as entradas ja inseridas.
+        """
+        _atoms: dict[str, str] = {}
+
+        def _canon(s: str) -> str:
+            return _atoms.setdefault(s, s)
+
+        # Indices posicionais resolvidos uma vez a partir do
+        # header, sem o dict por linha do DictReader.
+        reader = csv.reader(fh, delimiter=";")
+        header = next(reader, None)
+        if header is None:
+            return
+        idx_map = {
+            h.strip().upper(): i
+            for i, h in enumerate(header)
+        }
+
+        def _col(*names: str) -> int:
+            for name in names:
+                if name in idx_map:
+                    return idx_map[name]
+            return -1
+
+        i_subst = _col("SUBSTANCIA", "PRINCIPIO_ATIVO")
+        i_prod = _col("PRODUTO", "MEDICAMENTO")
+        i_apres = _col("APRESENTACAO")
+        i_lab = _col("LABORATORIO")
+        i_pf_sem = _col("PF_SEM_IMPOSTOS")
+        i_pmvg_sem = _col("PMVG_SEM_IMPOSTOS")
+        i_pmvg_com = _col("PMVG_COM_IMPOSTOS")
+        i_lista = _col("LISTA_CONCESSAO")
+        i_data = _col("DATA_PUBLICACAO")
+
+        def _get(row: list, i: int) -> str:
+            return row[i] if 0 <= i < len(row) else ""
+
+        def _parse_price(row: list, i: int) -> float:
+            v = _get(row, i).strip().translate(
+                _PRECO_TABLE
+            )
+            try:
+                return float(v)
+            except ValueError:
+                return 0.0
+
+        today_iso = datetime.now().strftime("%Y-%m-%d")
+        for row in reader:
+            substancia = _get(row, i_subst).strip()
+            produto = _get(row, i_prod).strip()
+            apresentacao = _get(row, i_apres).strip()
+
+            entry = CMEDPreco(
+                medicamento=f"{substancia} - {produto}",
+                apresentacao=_canon(apresentacao),
+                laboratorio=_canon(
+                    _get(row, i_lab).strip()
+                ),
+                pf_sem_impostos=_parse_price(
+                    row, i_pf_sem
+                ),
+                pmvg_sem_impostos=_parse_price(
+                    row, i_pmvg_sem
+                ),
+                pmvg_com_impostos=_parse_price(
+                    row, i_pmvg_com
+                ),
+                lista_concessao=_canon(
+                    _get(row, i_lista).strip()
+                ),
+                data_publicacao=_canon(
+                    _get(row, i_data).strip()
+                    or today_iso
+                ),
+            )
+
+            key = self._cmed_key(
+                substancia or produto, apresentacao
+            )
+            self._cmed_data[key] = entry
+            self._index_cmed_entry(key, entry.medicamento)
+
     async def ensure_cmed_loaded(self):
         """Load CMED data from local cache if available."""
         if self._cmed_loaded:
@@ -367,6 +739,10 @@ class BPSClient:
 
     def _load_cmed_xls(self, path: Path):
         """Parse CMED XLS using openpyxl."""
+        sidecar = path.with_suffix(".pkl")
+        if self._load_cmed_sidecar(sidecar, path):
+            return
+
         try:
             import openpyxl
         except ImportError:
@@ -375,7 +751,12 @@ class BPSClient:
             )
             return
 
-        wb = openpyxl.load_workbook(path, data_only=True)
+        # read_only transforma a carga em streaming: as linhas sao
+        # lidas sob demanda em iter_rows, sem materializar o grafo
+        # de celulas do workbook inteiro.
+        wb = openpyxl.load_workbook(
+            path, data_only=True, read_only=True
+        )
         ws = wb.active
         if ws is None:
             return
@@ -387,21 +768,16 @@ class BPSClient:
 
         col_map = {}
         for i, h in enumerate(headers):
-            if "SUBSTANCIA" in h or "PRINCIPIO" in h:
-                col_map["substancia"] = i
-            elif "PRODUTO" in h or "MEDICAMENTO" in h:
-                col_map["produto"] = i
-            elif "APRESENTA" in h:
-                col_map["apresentacao"] = i
-            elif "LABORAT" in h:
-                col_map["laboratorio"] = i
-            elif "PMVG" in h and "SEM" in h:
-                col_map["pmvg_sem"] = i
-            elif "PMVG" in h:
-                col_map["pmvg_com"] = i
-            elif "PF" in h and "SEM" in h:
-                col_map["pf_sem"] = i
+            m = _CMED_HEADER_RE.search(h)
+            if m:
+                col_map.setdefault(m.lastgroup, i)
+
+        _atoms: dict[str, str] = {}
 
+        def _canon(s: str) -> str:
+            return _atoms.setdefault(s, s)
+
+        today_iso = datetime.now().strftime("%Y-%m-%d")
         for row in ws.iter_rows(min_row=2, values_only=True):
             substancia = str(
                 row[col_map.get("substancia", 0)] or ""
@@ -425,29 +801,106 @@ class BPSClient:
 
             entry = CMEDPreco(
                 medicamento=f"{substancia} - {produto}",
-                apresentacao=apresentacao,
-                laboratorio=str(
+                apresentacao=_canon(apresentacao),
+                laboratorio=_canon(str(
                     row[col_map.get("laboratorio", 3)] or ""
-                ).strip(),
+                ).strip()),
                 pf_sem_impostos=_val("pf_sem"),
                 pmvg_sem_impostos=_val("pmvg_sem"),
                 pmvg_com_impostos=_val("pmvg_com"),
                 lista_concessao="",
-                data_publicacao=datetime.now().strftime(
-                    "%Y-%m-%d"
-                ),
+                data_publicacao=today_iso,
             )
             key = self._cmed_key(
                 substancia or produto, apresentacao
             )
             self._cmed_data[key] = entry
+            self._index_cmed_entry(key, entry.medicamento)
 
+        wb.close()
         self._cmed_loaded = True
+        self._teto_cache.clear()
+        self._write_cmed_sidecar(sidecar)
         logger.info(
             "Loaded %d CMED entries from XLS %s",
             len(self._cmed_data), path,
         )
 
+    def _load_cmed_sidecar(
+        self, sidecar: Path, source: Path
+    ) -> bool:
+        """Tenta recarregar a tabela CMED do sidecar serializado."""
+        try:
+            if (
+                not sidecar.exists()
+                or sidecar.stat().st_mtime
+                < source.stat().st_mtime
+            ):
+                return False
+            with sidecar.open("rb") as fh:
+                self._cmed_data = pickle.load(fh)
+        except (OSError, pickle.PickleError, EOFError) as exc:
+            logger.warning(
+                "Ignoring CMED sidecar %s: %s", sidecar, exc
+            )
+            return False
+        self._cmed_by_med = {}
+        self._cmed_trigrams = {}
+        for key, entry in self._cmed_data.items():
+            self._index_cmed_entry(key, entry.medicamento)
+        self._cmed_loaded = True
+        self._teto_cache.clear()
+        logger.info(
+            "Loaded %d CMED entries from sidecar %s",
+            len(self._cmed_data), sidecar,
+        )
+        return True
+
+    def _write_cmed_sidecar(self, sidecar: Path):
+        """Serializa a tabela CMED parseada para o sidecar."""
+        try:
+            with sidecar.open("wb") as fh:
+                pickle.dump(
+                    self._cmed_data,
+                    fh,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+        except (OSError, pickle.PickleError) as exc:
+            logger.warning(
+                "Could not write CMED sidecar %s: %s",
+                sidecar, exc,
+            )
+
+    def _index_cmed_entry(self, key: str, medicamento: str):
+        """Registra o medicamento nos indices de get_cmed_teto."""
+        med_up = medicamento.upper()
+        keys = self._cmed_by_med.setdefault(med_up, [])
+        if key not in keys:
+            keys.append(key)
+        for j in range(len(med_up) - 2):
+            self._cmed_trigrams.setdefault(
+                med_up[j:j + 3], set()
+            ).add(key)
+
+    def _cmed_candidates(self, medicamento: str):
+        """Chaves CMED candidatas para o caminho fuzzy.
+
+        Mesma estrategia de _bps_candidates: interseta os postings
+        dos trigramas do termo, que sao superconjuntos de qualquer
+        match por substring. Termos curtos caem na varredura
+        completa.
+        """
+        term = medicamento.upper()
+        if len(term) < 3:
+            return self._cmed_data
+        postings = [
+            self._cmed_trigrams.get(term[j:j + 3])
+            for j in range(len(term) - 2)
+        ]
+        if any(p is None for p in postings):
+            return ()
+        return set.intersection(*postings)
+
     def get_cmed_teto(
         self,
         medicamento: str,
@@ -466,21 +919,49 @@ class BPSClient:
         Returns:
             CMEDPreco com teto ou None
         """
+        cache_key = (medicamento, apresentacao or "")
+        if cache_key in self._teto_cache:
+            return self._teto_cache[cache_key]
+        entry = self._lookup_cmed_teto(
+            medicamento, apresentacao
+        )
+        self._teto_cache[cache_key] = entry
+        return entry
+
+    def _lookup_cmed_teto(
+        self,
+        medicamento: str,
+        apresentacao: Optional[str],
+    ) -> Optional[CMEDPreco]:
+        """Resolucao exata + fuzzy do teto, sem memoizacao."""
         # Try exact key match first
         key = self._cmed_key(medicamento, apresentacao or "")
         if key in self._cmed_data:
             return self._cmed_data[key]
 
-        # Fuzzy search
-        pattern = re.compile(
-            re.escape(medicamento), re.IGNORECASE
+        apres_lc = apresentacao.lower() if apresentacao else None
+
+        # Probe O(1) pelo medicamento normalizado
+        exact_keys = self._cmed_by_med.get(
+            medicamento.strip().upper()
         )
-        for entry_key, entry in self._cmed_data.items():
-            if pattern.search(entry.medicamento):
-                if apresentacao:
-                    if apresentacao.lower() in entry.apresentacao.lower():
-                        return entry
-                else:
+        if exact_keys:
+            for entry_key in exact_keys:
+                entry = self._cmed_data[entry_key]
+                if (
+                    apres_lc is None
+                    or apres_lc in entry.apresentacao.lower()
+                ):
+                    return entry
+
+        # Fuzzy search restrita as chaves candidatas do indice
+        needle = medicamento.upper()
+        for entry_key in self._cmed_candidates(medicamento):
+            entry = self._cmed_data[entry_key]
+            if needle in entry.medicamento.upper():
+                if apres_lc is None:
+                    return entry
+                if apres_lc in entry.apresentacao.lower():
                     return entry
 
         return None
@@ -11,63 +11,72 @@ BPS, CMED, ANP) with:
 """
 
 import asyncio
-import hashlib
+import functools
 import json
 import logging
 import os
+import random
+import re
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlencode, urljoin
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(value) -> bytes:
+        return json.dumps(value).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # Credentials
 # ---------------------------------------------------------------------------
 
-_CREDENTIALS_CACHE: Optional[dict] = None
+# Linhas PROCUREMENT_X=valor de um .env, com aspas opcionais;
+# comentarios e outras chaves nao casam.
+_ENV_LINE_RE = re.compile(
+    r"^\s*(PROCUREMENT_\w+)\s*=\s*"
+    r"[\"']?([^\"'\n]*?)[\"']?\s*$",
+    re.MULTILINE,
+)
 
 
+@functools.cache
 def load_credentials() -> dict:
     """
     Load API credentials from environment or .env file.
 
     Searches for keys prefixed with ``PROCUREMENT_`` in env vars.
     Falls back to a ``.env`` file in the project root if present.
+    Memoizado: o .env e lido e o ambiente varrido uma unica vez
+    por processo.
 
     Returns:
         dict mapping credential names to values
     """
-    global _CREDENTIALS_CACHE
-    if _CREDENTIALS_CACHE is not None:
-        return _CREDENTIALS_CACHE
-
     creds: dict = {}
 
-    # Try loading .env file (simple key=value parser)
     env_path = Path(
         os.environ.get("CLAUDE_PROJECT_DIR", ".")
     ) / ".env"
     if env_path.exists():
-        with env_path.open() as fh:
-            for line in fh:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if "=" in line:
-                    key, _, value = line.partition("=")
-                    key = key.strip()
-                    value = value.strip().strip("\"'")
-                    if key.startswith("PROCUREMENT_"):
-                        creds[key] = value
-
-    # Override with actual environment variables
-    for key, value in os.environ.items():
-        if key.startswith("PROCUREMENT_"):
-            creds[key] = value
-
-    _CREDENTIALS_CACHE = creds
+        creds.update(
+            _ENV_LINE_RE.findall(env_path.read_text())
+        )
+
+    # Environment variables override the .env file
+    creds.update({
+        key: value
+        for key, value in os.environ.items()
+        if key.startswith("PROCUREMENT_")
+    })
     return creds
 
 
@@ -100,26 +109,100 @@ class HTTPError(Exception):
 
 
 class TTLCache:
-    """Simple in-memory cache with per-entry TTL."""
+    """Simple in-memory cache with per-entry TTL.
 
-    def __init__(self, default_ttl: int = 900):
-        self._store: dict = {}
-        self.default_ttl = default_ttl
+    Valores sao guardados serializados (JSON em bytes) e
+    desserializados a cada hit: cada chamador recebe um grafo de
+    objetos proprio, entao mutacoes no resultado nao corrompem a
+    entrada cacheada.
+    """
 
-    def _key(self, url: str, params: Optional[dict]) -> str:
-        raw = url + (json.dumps(params, sort_keys=True) if params else "")
-        return hashlib.sha256(raw.encode()).hexdigest()
+    # A cada tantos stores, varre entradas expiradas que nunca
+    # voltaram a ser consultadas
+    _SWEEP_EVERY = 128
 
-    def get(self, url: str, params: Optional[dict] = None):
-        """Return cached value or None if missing/expired."""
+    def __init__(
+        self, default_ttl: int = 900,
+        max_entries: int = 1024,
+    ):
+        self._store: OrderedDict = OrderedDict()
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._sets_since_sweep = 0
+
+    def _key(self, url: str, params: Optional[dict]):
+        # Chave de dict comum: hash de tupla pequena e feito em C e
+        # dispensa o digest criptografico (nao ha adversario aqui).
+        if not params:
+            return (url, None)
+        return (url, tuple(sorted(params.items())))
+
+    def lookup(
+        self, url: str, params: Optional[dict] = None
+    ):
+        """Return (valor cacheado ou None, chave calculada).
+
+        Devolver a chave permite ao chamador reaproveita-la em
+        store() no caminho de miss, sem recalcular.
+        """
         key = self._key(url, params)
         entry = self._store.get(key)
         if entry is None:
-            return None
-        value, expires = entry
-        if time.time() > expires:
-            del self._store[key]
-            return None
+            return None, key
+        serialized, payload, deadline = entry
+        if time.monotonic() > deadline:
+            # Sem remocao no caminho de leitura; a varredura
+            # periodica em store() recolhe os expirados
+            return None, key
+        self._store.move_to_end(key)
+        if serialized:
+            return _json_loads(payload), key
+        return payload, key
+
+    def store(self, key, value, ttl: Optional[int] = None):
+        """Store a value under a key from lookup()."""
+        # A entrada marca explicitamente se o payload foi
+        # serializado; inferir pelo tipo confundiria um valor bytes
+        # guardado pelo chamador com JSON serializado. So dict/list
+        # (os corpos JSON do get_json) passam pelo round-trip; os
+        # demais tipos ficam como referencia viva para nao mudar de
+        # forma (tupla viraria lista, chave int viraria str).
+        serialized = False
+        payload = value
+        if isinstance(value, (dict, list)):
+            try:
+                payload = _json_dumps(value)
+                serialized = True
+            except TypeError:
+                # Valor nao serializavel: guarda a referencia viva
+                # (chamadores nao devem muta-la)
+                payload = value
+        self._store[key] = (
+            serialized,
+            payload,
+            time.monotonic() + (ttl or self.default_ttl),
+        )
+        self._store.move_to_end(key)
+        while len(self._store) > self.max_entries:
+            self._store.popitem(last=False)
+        self._sets_since_sweep += 1
+        if self._sets_since_sweep >= self._SWEEP_EVERY:
+            self._sets_since_sweep = 0
+            self.cleanup()
+
+    def cleanup(self):
+        """Remove todas as entradas ja expiradas."""
+        now = time.monotonic()
+        expired = [
+            k for k, (_, _, deadline) in self._store.items()
+            if now > deadline
+        ]
+        for k in expired:
+            del self._store[k]
+
+    def get(self, url: str, params: Optional[dict] = None):
+        """Return cached value or None if missing/expired."""
+        value, _ = self.lookup(url, params)
         return value
 
     def set(
@@ -127,11 +210,7 @@ class TTLCache:
         ttl: Optional[int] = None,
     ):
         """Store a value with TTL."""
-        key = self._key(url, params)
-        self._store[key] = (
-            value,
-            time.time() + (ttl or self.default_ttl),
-        )
+        self.store(self._key(url, params), value, ttl)
 
     def clear(self):
         """Flush all entries."""
@@ -146,10 +225,35 @@ class TTLCache:
 MAX_RETRIES = 4
 INITIAL_BACKOFF = 2  # seconds
 BACKOFF_FACTOR = 2
+MAX_BACKOFF = 60  # seconds
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Espera com full jitter para a tentativa dada.
+
+    Sorteia uniformemente dentro da janela exponencial (limitada a
+    MAX_BACKOFF) para que clientes afetados pela mesma falha nao
+    re-tentem todos no mesmo instante.
+    """
+    exp = min(
+        INITIAL_BACKOFF * (BACKOFF_FACTOR ** attempt),
+        MAX_BACKOFF,
+    )
+    return random.uniform(0, exp)
 
 # Status codes that trigger a retry
 RETRIABLE_STATUSES = {429, 500, 502, 503, 504}
 
+# Excecoes de transporte que justificam nova tentativa; bugs de
+# programacao (TypeError etc.) e cancelamentos propagam na hora.
+try:
+    import httpx as _httpx
+    _RETRIABLE_EXC: tuple = (
+        _httpx.TransportError, OSError, asyncio.TimeoutError,
+    )
+except ImportError:
+    _RETRIABLE_EXC = (OSError, asyncio.TimeoutError)
+
 
 class CachedHTTPClient:
     """Async HTTP client with retry and caching.
@@ -163,30 +267,76 @@ class CachedHTTPClient:
         cache_ttl: int = 900,
         timeout: float = 30.0,
         headers: Optional[dict] = None,
+        pool_limits: Optional[dict] = None,
     ):
         self.cache = TTLCache(default_ttl=cache_ttl)
         self.timeout = timeout
+        # Dimensoes do pool de conexoes; sobreponiveis por carga de
+        # trabalho via pool_limits.
+        self.pool_limits = {
+            "max_connections": 100,
+            "max_keepalive_connections": 50,
+            "keepalive_expiry": 30.0,
+        }
+        if pool_limits:
+            self.pool_limits.update(pool_limits)
         self.default_headers = {
             "Accept": "application/json",
             "User-Agent": "ProcurementAgent/1.0",
         }
         if headers:
             self.default_headers.update(headers)
+        # Variante sem Accept para downloads binarios, montada uma
+        # vez; requisicoes sem headers extras reutilizam os dicts
+        # padrao sem copia.
+        self._bytes_headers = {
+            k: v for k, v in self.default_headers.items()
+            if k != "Accept"
+        }
         self._httpx_client = None
+        # Lock criado sob demanda (precisa de um loop rodando);
+        # evita que primeiras chamadas concorrentes construam
+        # varios AsyncClient e vazem conexoes.
+        self._init_lock: Optional[asyncio.Lock] = None
+        self._httpx_missing = False
 
     async def _ensure_httpx(self):
-        """Lazily create an httpx.AsyncClient."""
-        if self._httpx_client is not None:
+        """Lazily create an httpx.AsyncClient (once)."""
+        if self._httpx_client is not None or self._httpx_missing:
             return
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if (
+                self._httpx_client is not None
+                or self._httpx_missing
+            ):
+                return
+            self._build_httpx()
+
+    def _build_httpx(self):
+        """Construct the httpx.AsyncClient, if importable."""
         try:
             import httpx
-            self._httpx_client = httpx.AsyncClient(
-                timeout=self.timeout,
-                headers=self.default_headers,
-                follow_redirects=True,
-            )
         except ImportError:
-            self._httpx_client = None
+            self._httpx_missing = True
+            return
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+        # Pool generoso de keep-alive: os varios clientes
+        # (PNCP, SINAPI, BPS, ANP, SICRO) compartilham esta
+        # instancia e reutilizam conexoes TLS entre consultas;
+        # HTTP/2 multiplexa quando o pacote h2 esta instalado.
+        self._httpx_client = httpx.AsyncClient(
+            timeout=self.timeout,
+            headers=self.default_headers,
+            follow_redirects=True,
+            http2=http2,
+            limits=httpx.Limits(**self.pool_limits),
+        )
 
     async def get_json(
         self,
@@ -215,15 +365,17 @@ class CachedHTTPClient:
         Raises:
             HTTPError: After all retries exhausted
         """
+        cache_key = None
         if not skip_cache:
-            cached = self.cache.get(url, params)
+            cached, cache_key = self.cache.lookup(url, params)
             if cached is not None:
                 return cached
 
         await self._ensure_httpx()
-        merged_headers = dict(self.default_headers)
-        if headers:
-            merged_headers.update(headers)
+        merged_headers = (
+            self.default_headers if headers is None
+            else {**self.default_headers, **headers}
+        )
 
         last_exc: Optional[Exception] = None
         for attempt in range(MAX_RETRIES):
@@ -231,8 +383,10 @@ class CachedHTTPClient:
                 data = await self._do_get(
                     url, params, merged_headers
                 )
-                self.cache.set(
-                    url, data, params=params, ttl=cache_ttl
+                if cache_key is None:
+                    cache_key = self.cache._key(url, params)
+                self.cache.store(
+                    cache_key, data, ttl=cache_ttl
                 )
                 return data
             except HTTPError as exc:
@@ -242,19 +396,15 @@ class CachedHTTPClient:
                     and exc.status not in RETRIABLE_STATUSES
                 ):
                     raise
-                wait = INITIAL_BACKOFF * (
-                    BACKOFF_FACTOR ** attempt
-                )
+                wait = _backoff_delay(attempt)
                 logger.info(
                     "Retry %d/%d for %s in %.1fs",
                     attempt + 1, MAX_RETRIES, url, wait,
                 )
                 await asyncio.sleep(wait)
-            except Exception as exc:
+            except _RETRIABLE_EXC as exc:
                 last_exc = exc
-                wait = INITIAL_BACKOFF * (
-                    BACKOFF_FACTOR ** attempt
-                )
+                wait = _backoff_delay(attempt)
                 logger.info(
                     "Retry %d/%d for %s in %.1fs (%s)",
                     attempt + 1, MAX_RETRIES, url, wait, exc,
@@ -290,10 +440,10 @@ class CachedHTTPClient:
             HTTPError: After all retries exhausted
         """
         await self._ensure_httpx()
-        merged_headers = dict(self.default_headers)
-        merged_headers.pop("Accept", None)
-        if headers:
-            merged_headers.update(headers)
+        merged_headers = (
+            self._bytes_headers if headers is None
+            else {**self._bytes_headers, **headers}
+        )
 
         last_exc: Optional[Exception] = None
         for attempt in range(MAX_RETRIES):
@@ -301,11 +451,22 @@ class CachedHTTPClient:
                 return await self._do_get_bytes(
                     url, params, merged_headers
                 )
-            except Exception as exc:
+            except HTTPError as exc:
                 last_exc = exc
-                wait = INITIAL_BACKOFF * (
-                    BACKOFF_FACTOR ** attempt
+                if (
+                    exc.status is not None
+                    and exc.status not in RETRIABLE_STATUSES
+                ):
+                    raise
+                wait = _backoff_delay(attempt)
+                logger.info(
+                    "Retry bytes %d/%d for %s in %.1fs",
+                    attempt + 1, MAX_RETRIES, url, wait,
                 )
+                await asyncio.sleep(wait)
+            except _RETRIABLE_EXC as exc:
+                last_exc = exc
+                wait = _backoff_delay(attempt)
                 logger.info(
                     "Retry bytes %d/%d for %s in %.1fs",
                     attempt + 1, MAX_RETRIES, url, wait,
@@ -343,14 +504,21 @@ class CachedHTTPClient:
             url, params=params, headers=headers
         )
         if resp.status_code >= 400:
+            # Fatia os bytes antes de decodificar: corpos de erro
+            # grandes nao pagam um decode completo so para a
+            # mensagem da excecao
+            snippet = resp.content[:200].decode(
+                "utf-8", errors="replace"
+            )
             raise HTTPError(
-                f"HTTP {resp.status_code}: {resp.text[:200]}",
+                f"HTTP {resp.status_code}: {snippet}",
                 status=resp.status_code,
                 url=url,
             )
         if not resp.content:
             return None
-        return resp.json()
+        # orjson aceita bytes direto; pula o decode do resp.json()
+        return _json_loads(resp.content)
 
     async def _do_get_urllib(
         self, url: str, params: Optional[dict],
@@ -368,16 +536,15 @@ class CachedHTTPClient:
             full_url, headers=headers
         )
 
-        loop = asyncio.get_event_loop()
         try:
-            resp = await loop.run_in_executor(
-                None,
-                lambda: urllib.request.urlopen(req, timeout=self.timeout),
+            resp = await asyncio.to_thread(
+                urllib.request.urlopen,
+                req, timeout=self.timeout,
             )
             body = resp.read()
             if not body:
                 return None
-            return json.loads(body)
+            return _json_loads(body)
         except urllib.error.HTTPError as exc:
             raise HTTPError(
                 f"HTTP {exc.code}: {exc.reason}",
@@ -418,11 +585,10 @@ class CachedHTTPClient:
         req = urllib.request.Request(
             full_url, headers=headers
         )
-        loop = asyncio.get_event_loop()
         try:
-            resp = await loop.run_in_executor(
-                None,
-                lambda: urllib.request.urlopen(req, timeout=self.timeout),
+            resp = await asyncio.to_thread(
+                urllib.request.urlopen,
+                req, timeout=self.timeout,
             )
             return resp.read()
         except urllib.error.HTTPError as exc:
@@ -435,3 +601,9 @@ class CachedHTTPClient:
         if self._httpx_client is not None:
             await self._httpx_client.aclose()
             self._httpx_client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
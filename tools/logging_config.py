@@ -7,30 +7,146 @@ Provides:
 - audit_log() function for structured audit entries
 """
 
+import atexit
 import json
 import logging
 import os
+import queue
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import orjson
+
+    def _dumps_line(entry: dict) -> bytes:
+        return orjson.dumps(entry, default=str) + b"\n"
+
+except ImportError:  # fallback para json da stdlib
+
+    def _dumps_line(entry: dict) -> bytes:
+        return (
+            json.dumps(entry, ensure_ascii=False, default=str)
+            + "\n"
+        ).encode("utf-8")
+
 
 AUDIT_LOG_PATH = Path(
     os.environ.get("AUDIT_LOG", "logs/audit.jsonl")
 )
 
+# Prefixo de timestamp (ate o segundo) memoizado: linhas de log do
+# mesmo segundo reutilizam a string e so formatam os microssegundos.
+_last_ts: tuple[int, str] = (0, "")
+
+
+def _utc_isoformat_z() -> str:
+    """Timestamp UTC ISO-8601 com sufixo Z, barato em rajadas."""
+    global _last_ts
+    t = time.time()
+    whole = int(t)
+    if whole != _last_ts[0]:
+        prefix = datetime.fromtimestamp(
+            whole, timezone.utc
+        ).strftime("%Y-%m-%dT%H:%M:%S")
+        _last_ts = (whole, prefix)
+    return f"{_last_ts[1]}.{int((t - whole) * 1e6):06d}Z"
+
+# Escritor de auditoria em lote: quando ativo, audit_log apenas
+# enfileira a linha e uma thread de fundo agrupa as escritas em um
+# unico open/writelines, tirando os syscalls do caminho da chamada.
+_audit_queue: Optional[queue.Queue] = None
+_audit_thread: Optional[threading.Thread] = None
+
+
+def start_audit_writer(
+    batch_size: int = 64, flush_interval: float = 0.1
+):
+    """Inicia a thread de escrita em lote do log de auditoria.
+
+    Idempotente; chamada por configure_logging. Entradas pendentes
+    sao descarregadas no encerramento via atexit.
+
+    Args:
+        batch_size: Maximo de linhas por escrita
+        flush_interval: Tempo maximo (s) segurando uma linha
+    """
+    global _audit_queue, _audit_thread
+    if _audit_thread is not None and _audit_thread.is_alive():
+        return
+    _audit_queue = queue.Queue()
+    _audit_thread = threading.Thread(
+        target=_audit_writer_loop,
+        args=(_audit_queue, batch_size, flush_interval),
+        name="audit-writer",
+        daemon=True,
+    )
+    _audit_thread.start()
+    atexit.register(stop_audit_writer)
+
+
+def stop_audit_writer():
+    """Encerra a thread de escrita, descarregando a fila."""
+    global _audit_queue, _audit_thread
+    if _audit_queue is None:
+        return
+    _audit_queue.put(None)
+    if _audit_thread is not None:
+        _audit_thread.join(timeout=5)
+    _audit_queue = None
+    _audit_thread = None
+
+
+def _audit_writer_loop(
+    q: queue.Queue, batch_size: int, flush_interval: float
+):
+    buf: list[bytes] = []
+    stop = False
+    while not stop:
+        try:
+            item = q.get(timeout=flush_interval)
+            if item is None:
+                stop = True
+            else:
+                buf.append(item)
+                # Drena o que mais estiver pronto, sem bloquear
+                while len(buf) < batch_size:
+                    try:
+                        item = q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    buf.append(item)
+        except queue.Empty:
+            pass
+        if buf:
+            _write_audit_batch(buf)
+            buf = []
+
+
+def _write_audit_batch(lines: list[bytes]):
+    try:
+        AUDIT_LOG_PATH.parent.mkdir(
+            parents=True, exist_ok=True
+        )
+        with AUDIT_LOG_PATH.open("ab") as f:
+            f.writelines(lines)
+    except OSError as exc:
+        logging.getLogger(__name__).warning(
+            "Audit batch write failed: %s", exc
+        )
+
 
 class JSONFormatter(logging.Formatter):
     """Format log records as JSON lines."""
 
     def format(self, record: logging.LogRecord) -> str:
         entry = {
-            "timestamp": (
-                datetime.now(timezone.utc)
-                .isoformat()
-                .replace("+00:00", "Z")
-            ),
+            "timestamp": _utc_isoformat_z(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -88,6 +204,8 @@ def configure_logging(
         fh.setFormatter(JSONFormatter())
         root.addHandler(fh)
 
+    start_audit_writer()
+
 
 def audit_log(
     tool: str,
@@ -95,6 +213,7 @@ def audit_log(
     result: Any,
     duration_ms: float,
     success: bool = True,
+    sink: Optional[Any] = None,
 ):
     """Write a structured audit entry to the audit log file.
 
@@ -104,27 +223,29 @@ def audit_log(
         result: Result returned by the tool
         duration_ms: Execution time in milliseconds
         success: Whether the call succeeded
+        sink: Optional object with .write(line); when given, the
+            JSON line goes there instead of AUDIT_LOG_PATH (useful
+            for tests and in-memory capture)
     """
     entry = {
-        "timestamp": (
-            datetime.now(timezone.utc)
-            .isoformat()
-            .replace("+00:00", "Z")
-        ),
+        "timestamp": _utc_isoformat_z(),
         "tool": tool,
         "params": params,
         "success": success,
         "duration_ms": round(duration_ms, 2),
         "result_summary": _summarize(result),
     }
+    raw = _dumps_line(entry)
+    if sink is not None:
+        sink.write(raw.decode("utf-8"))
+        return
+    q = _audit_queue
+    if q is not None:
+        q.put(raw)
+        return
     AUDIT_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with AUDIT_LOG_PATH.open("a", encoding="utf-8") as f:
-        f.write(
-            json.dumps(
-                entry, ensure_ascii=False, default=str
-            )
-            + "\n"
-        )
+    with AUDIT_LOG_PATH.open("ab") as f:
+        f.write(raw)
 
 
 def _summarize(result: Any) -> str:
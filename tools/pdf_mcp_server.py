@@ -8,6 +8,8 @@ Usage:
     python -m tools.pdf_mcp_server
 """
 
+import asyncio
+import itertools
 import json
 import logging
 import time
@@ -300,11 +302,31 @@ def create_pdf_mcp_server() -> FastMCP:
         """
         start = time.time()
         try:
-            matches = processor.search_content(
-                query,
-                filepath=filepath,
-                case_sensitive=case_sensitive,
-            )
+            if filepath is None:
+                # Cada PDF e independente: despacha um por thread,
+                # com o semaforo limitando o fan-out.
+                sem = asyncio.Semaphore(8)
+
+                async def _bounded(path: str) -> list:
+                    async with sem:
+                        return await asyncio.to_thread(
+                            processor.search_one,
+                            query, path, case_sensitive,
+                        )
+
+                per_file = await asyncio.gather(*(
+                    _bounded(pdf["filename"])
+                    for pdf in processor.list_pdfs()
+                ))
+                matches = list(
+                    itertools.chain.from_iterable(per_file)
+                )
+            else:
+                matches = processor.search_content(
+                    query,
+                    filepath=filepath,
+                    case_sensitive=case_sensitive,
+                )
             result = {
                 "success": True,
                 "query": query,
@@ -27,6 +27,22 @@ from typing import Optional
 
 import pymupdf
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _dump_cache_bytes(data: dict) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+except ImportError:  # fallback para json da stdlib
+    _json_loads = json.loads
+
+    def _dump_cache_bytes(data: dict) -> bytes:
+        return json.dumps(
+            data, ensure_ascii=False, indent=2
+        ).encode("utf-8")
+
 logger = logging.getLogger(__name__)
 
 DOCS_DIR = Path(
@@ -414,30 +430,71 @@ class PDFProcessor:
                 files.extend(self.docs_dir.glob(ext))
 
         for pdf_path in sorted(files):
-            try:
-                result = self.extract_text(
-                    str(pdf_path),
-                    extract_tables=False,
-                    use_cache=True,
-                )
-            except Exception as e:
-                logger.warning(
-                    "Skipping %s: %s", pdf_path.name, e
-                )
-                continue
+            matches.extend(
+                self._search_file(pdf_path, pattern)
+            )
 
-            for page in result.pages:
-                for m in pattern.finditer(page.text):
-                    start = max(0, m.start() - 100)
-                    end = min(len(page.text), m.end() + 100)
-                    context = page.text[start:end].strip()
+        return matches
 
-                    matches.append({
-                        "filename": pdf_path.name,
-                        "page": page.page_number,
-                        "match": m.group(),
-                        "context": f"...{context}...",
-                    })
+    def search_one(
+        self,
+        query: str,
+        filepath: str,
+        case_sensitive: bool = False,
+    ) -> list[dict]:
+        """Search for text in a single PDF.
+
+        Unidade independente de trabalho usada pelo fan-out
+        concorrente do servidor MCP; um arquivo por chamada.
+
+        Args:
+            query: Text to search for
+            filepath: PDF to search
+            case_sensitive: Whether to match case
+
+        Returns:
+            List of matches with file, page, and context
+        """
+        flags = 0 if case_sensitive else re.IGNORECASE
+        pattern = re.compile(re.escape(query), flags)
+        try:
+            path = self._resolve_path(filepath)
+        except (FileNotFoundError, ValueError) as e:
+            # Mesma semantica da varredura sequencial: um arquivo
+            # problematico e pulado, nao derruba a busca inteira
+            logger.warning("Skipping %s: %s", filepath, e)
+            return []
+        return self._search_file(path, pattern)
+
+    def _search_file(
+        self, pdf_path: Path, pattern: re.Pattern
+    ) -> list[dict]:
+        """Run a compiled pattern over one PDF's pages."""
+        try:
+            result = self.extract_text(
+                str(pdf_path),
+                extract_tables=False,
+                use_cache=True,
+            )
+        except Exception as e:
+            logger.warning(
+                "Skipping %s: %s", pdf_path.name, e
+            )
+            return []
+
+        matches = []
+        for page in result.pages:
+            for m in pattern.finditer(page.text):
+                start = max(0, m.start() - 100)
+                end = min(len(page.text), m.end() + 100)
+                context = page.text[start:end].strip()
+
+                matches.append({
+                    "filename": pdf_path.name,
+                    "page": page.page_number,
+                    "match": m.group(),
+                    "context": f"...{context}...",
+                })
 
         return matches
 
@@ -574,8 +631,7 @@ class PDFProcessor:
             return None
 
         try:
-            with cache_file.open(encoding="utf-8") as f:
-                data = json.load(f)
+            data = _json_loads(cache_file.read_bytes())
 
             metadata = PDFMetadata(**data["metadata"])
             pages = [
@@ -608,10 +664,7 @@ class PDFProcessor:
                 "pages": [asdict(p) for p in result.pages],
                 "warnings": result.warnings,
             }
-            with cache_file.open("w", encoding="utf-8") as f:
-                json.dump(
-                    data, f, ensure_ascii=False, indent=2
-                )
+            cache_file.write_bytes(_dump_cache_bytes(data))
             logger.info(
                 "Cached transcription: %s", cache_file.name
             )
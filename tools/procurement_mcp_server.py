@@ -9,6 +9,7 @@ Usage:
 import asyncio
 import json
 import logging
+import mmap
 import os
 import time
 from dataclasses import asdict
@@ -19,6 +20,12 @@ from typing import Optional
 from mcp.server.fastmcp import FastMCP
 
 from tools.http_utils import CachedHTTPClient
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 from tools.pncp_client import PNCPClient
 from tools.sinapi_client import SINAPIClient
 from tools.bps_client import BPSClient
@@ -31,7 +38,7 @@ logger = logging.getLogger(__name__)
 class ProcurementTools:
     """Ferramentas para pesquisa de precos e consulta normativa."""
 
-    def __init__(self):
+    def __init__(self, http: Optional[CachedHTTPClient] = None):
         self.sources_log_path = Path(
             self._resolve_env(
                 "SOURCES_LOG", "sources/sources_log.jsonl"
@@ -44,8 +51,9 @@ class ProcurementTools:
             )
         )
 
-        # Shared HTTP client with retry + cache
-        self._http = CachedHTTPClient()
+        # Shared HTTP client with retry + cache (injectable so
+        # callers can reuse one client across instances)
+        self._http = http or CachedHTTPClient()
 
         # Specialized clients
         self.pncp = PNCPClient(http=self._http)
@@ -76,23 +84,36 @@ class ProcurementTools:
 
     def _load_sources(self):
         """Carrega fontes validas do log."""
-        self.sources = {}
-        if self.sources_log_path.exists():
-            with self.sources_log_path.open() as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        source = json.loads(line)
-                        self.sources[source["id"]] = source
+        self.sources = self._read_jsonl(self.sources_log_path)
+        self.price_sources = self._read_jsonl(
+            self.price_sources_path
+        )
+        # Memoizacao de validate_source; invalidada a cada reload.
+        self._validate_cache: dict[str, dict] = {}
 
-        self.price_sources = {}
-        if self.price_sources_path.exists():
-            with self.price_sources_path.open() as f:
-                for line in f:
+    @staticmethod
+    def _read_jsonl(path: Path) -> dict:
+        """Le um log JSONL e indexa as entradas por id.
+
+        O arquivo e mapeado em memoria (mmap) e cada linha passa
+        por orjson quando disponivel, evitando o overhead de
+        decodificacao linha a linha do modo texto.
+        """
+        sources: dict = {}
+        if not path.exists():
+            return sources
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return sources
+            with mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mm:
+                for line in mm.read().split(b"\n"):
                     line = line.strip()
                     if line:
-                        source = json.loads(line)
-                        self.price_sources[source["id"]] = source
+                        source = _json_loads(line)
+                        sources[source["id"]] = source
+        return sources
 
     def validate_source(self, source_id: str) -> dict:
         """
@@ -104,6 +125,14 @@ class ProcurementTools:
         Returns:
             dict com status da validacao
         """
+        cached = self._validate_cache.get(source_id)
+        if cached is not None:
+            return cached
+        result = self._validate_source_uncached(source_id)
+        self._validate_cache[source_id] = result
+        return result
+
+    def _validate_source_uncached(self, source_id: str) -> dict:
         source = self.sources.get(source_id)
         if source is None:
             source = self.price_sources.get(source_id)
@@ -99,56 +99,68 @@ class SINAPIClient:
             return
 
         with path.open(encoding="latin-1") as fh:
-            reader = csv.DictReader(fh, delimiter=";")
-            for row in reader:
-                codigo = (
-                    row.get("CODIGO", "")
-                    or row.get("CODIGO COMPOSICAO", "")
-                    or row.get("CODIGO DA COMPOSICAO", "")
-                ).strip()
-                if not codigo:
-                    continue
-
-                descricao = (
-                    row.get("DESCRICAO", "")
-                    or row.get("DESCRICAO DA COMPOSICAO", "")
-                    or row.get("DESCRICAO DO SERVICO", "")
-                ).strip()
-
-                unidade = (
-                    row.get("UNIDADE", "")
-                    or row.get("UNIDADE DE MEDIDA", "")
-                ).strip()
-
-                preco_str = (
-                    row.get("PRECO UNITARIO", "")
-                    or row.get("CUSTO TOTAL", "")
-                    or row.get("PRECO", "")
-                ).strip()
-                preco_str = (
-                    preco_str.replace(".", "").replace(",", ".")
-                )
-                try:
-                    preco = float(preco_str) if preco_str else 0.0
-                except ValueError:
-                    preco = 0.0
-
-                self._composicoes[codigo] = SINAPIComposicao(
-                    codigo=codigo,
-                    descricao=descricao,
-                    unidade=unidade,
-                    preco_unitario=preco,
-                    referencia_mes=self.referencia_mes,
-                    estado=self.estado,
-                    desonerado=False,
-                )
-
-        self._loaded = True
+            self.load_from_stream(fh)
         logger.info(
             "Loaded %d composicoes from %s",
             len(self._composicoes), path,
         )
 
+    def load_from_stream(self, stream):
+        """
+        Carrega composicoes a partir de um stream CSV ja aberto.
+
+        Aceita qualquer objeto file-like (arquivo, io.StringIO),
+        evitando disco quando os dados ja estao em memoria.
+
+        Args:
+            stream: Objeto file-like com conteudo CSV
+        """
+        reader = csv.DictReader(stream, delimiter=";")
+        for row in reader:
+            codigo = (
+                row.get("CODIGO", "")
+                or row.get("CODIGO COMPOSICAO", "")
+                or row.get("CODIGO DA COMPOSICAO", "")
+            ).strip()
+            if not codigo:
+                continue
+
+            descricao = (
+                row.get("DESCRICAO", "")
+                or row.get("DESCRICAO DA COMPOSICAO", "")
+                or row.get("DESCRICAO DO SERVICO", "")
+            ).strip()
+
+            unidade = (
+                row.get("UNIDADE", "")
+                or row.get("UNIDADE DE MEDIDA", "")
+            ).strip()
+
+            preco_str = (
+                row.get("PRECO UNITARIO", "")
+                or row.get("CUSTO TOTAL", "")
+                or row.get("PRECO", "")
+            ).strip()
+            preco_str = (
+                preco_str.replace(".", "").replace(",", ".")
+            )
+            try:
+                preco = float(preco_str) if preco_str else 0.0
+            except ValueError:
+                preco = 0.0
+
+            self._composicoes[codigo] = SINAPIComposicao(
+                codigo=codigo,
+                descricao=descricao,
+                unidade=unidade,
+                preco_unitario=preco,
+                referencia_mes=self.referencia_mes,
+                estado=self.estado,
+                desonerado=False,
+            )
+
+        self._loaded = True
+
     async def ensure_loaded(self):
         """
         Ensure data is loaded. Tries local cache first, then